@@ -0,0 +1,33 @@
+"""add generation checkpoints
+
+Revision ID: 3c4d5e6f7a8b
+Revises: 2b3c4d5e6f7a
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '3c4d5e6f7a8b'
+down_revision = '2b3c4d5e6f7a'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('generation_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('stage', sa.String(), nullable=False),
+        sa.Column('output', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('book_id', 'stage', name='uq_generation_checkpoints_book_stage')
+    )
+    op.create_index(op.f('ix_generation_checkpoints_id'), 'generation_checkpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_generation_checkpoints_book_id'), 'generation_checkpoints', ['book_id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_generation_checkpoints_book_id'), table_name='generation_checkpoints')
+    op.drop_index(op.f('ix_generation_checkpoints_id'), table_name='generation_checkpoints')
+    op.drop_table('generation_checkpoints')
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""add generation jobs
+
+Revision ID: 2b3c4d5e6f7a
+Revises: 1a2b3c4d5e6f
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models import JobStatus
+
+revision = '2b3c4d5e6f7a'
+down_revision = '1a2b3c4d5e6f'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('generation_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum(JobStatus), nullable=False, default=JobStatus.QUEUED),
+        sa.Column('attempts', sa.Integer(), nullable=False, default=0),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, default=3),
+        sa.Column('worker_id', sa.String(), nullable=True),
+        sa.Column('visible_at', sa.DateTime(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_generation_jobs_id'), 'generation_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_generation_jobs_book_id'), 'generation_jobs', ['book_id'], unique=False)
+    op.create_index(op.f('ix_generation_jobs_status'), 'generation_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_generation_jobs_visible_at'), 'generation_jobs', ['visible_at'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_generation_jobs_visible_at'), table_name='generation_jobs')
+    op.drop_index(op.f('ix_generation_jobs_status'), table_name='generation_jobs')
+    op.drop_index(op.f('ix_generation_jobs_book_id'), table_name='generation_jobs')
+    op.drop_index(op.f('ix_generation_jobs_id'), table_name='generation_jobs')
+    op.drop_table('generation_jobs')
\ No newline at end of file
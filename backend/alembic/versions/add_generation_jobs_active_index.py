@@ -0,0 +1,23 @@
+"""add unique active generation job per book
+
+Revision ID: 4d5e6f7a8b9c
+Revises: 3c4d5e6f7a8b
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '4d5e6f7a8b9c'
+down_revision = '3c4d5e6f7a8b'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index(
+        'uq_generation_jobs_active_book', 'generation_jobs', ['book_id'], unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')")
+    )
+
+def downgrade() -> None:
+    op.drop_index('uq_generation_jobs_active_book', table_name='generation_jobs')
\ No newline at end of file
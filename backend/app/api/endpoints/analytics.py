@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from app.models.agent import AgentType
 from app.models.analytics import AgentMetrics
 from app.services.analytics_service import analytics_service
+from app.services.supabase_executor import supabase_executor
 
 router = APIRouter()
 
@@ -50,7 +51,7 @@ async def export_metrics(
     if agent_type:
         query = query.eq('agent_type', agent_type)
 
-    result = query.execute()
+    result = await supabase_executor.execute(query)
 
     # Convert to CSV format
     import io
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -13,6 +14,82 @@ class Settings(BaseSettings):
     # Supabase settings
     SUPABASE_URL: str
     SUPABASE_KEY: str
+    SUPABASE_MAX_CONCURRENCY: int = 8
+    SUPABASE_TIMEOUT: float = 10.0  # seconds
+
+    # Shared LLM client pool settings
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_EXPIRY: float = 60.0
+    LLM_TIMEOUT: float = 600.0
+
+    # Generation job queue and worker settings
+    JOB_WORKER_PROCESSES: int = 2
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_VISIBILITY_TIMEOUT: int = 900  # seconds
+    JOB_POLL_INTERVAL: float = 2.0  # seconds
+    JOB_MAX_ATTEMPTS: int = 3
+
+    # Per-provider adaptive rate limits for LLM calls. The request quotas are account-wide;
+    # each process enforces its own token bucket with an equal share of them
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    ANTHROPIC_REQUESTS_PER_MINUTE: int = 50
+    # Processes sharing the quotas (API processes plus worker processes on every host);
+    # defaults to one API process plus JOB_WORKER_PROCESSES
+    LLM_RATE_LIMIT_PROCESSES: Optional[int] = None
+    # Concurrency limits apply per process
+    LLM_INITIAL_CONCURRENCY: int = 8
+    LLM_MAX_CONCURRENCY: int = 64
+
+    # In-process tier in front of the Supabase generation cache
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024
+    # Minimum expected generation seconds saved (frequency x generation time) to cache an entry
+    CACHE_ADMISSION_MIN_SECONDS: float = 10.0
+
+    # Opt-in near-duplicate prompt cache for the outliner
+    OUTLINER_SIMILARITY_CACHE: bool = False
+    OUTLINER_SIMILARITY_THRESHOLD: float = 0.9
+    OUTLINER_SIMILARITY_MAX_ENTRIES: int = 10000
+
+    # Compression of cached outputs; the dictionary is optional (e.g. from `zstd --train`)
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+    CACHE_COMPRESSION_DICT_PATH: Optional[str] = None
+
+    # Generation cache lifetime and the off-peak warm-up that extends hot entries (hours are UTC)
+    CACHE_TTL_HOURS: int = 24
+    CACHE_WARMUP_OFF_PEAK_START_HOUR: int = 2
+    CACHE_WARMUP_OFF_PEAK_END_HOUR: int = 6
+    CACHE_WARMUP_LOOKBACK_HOURS: int = 72
+    CACHE_WARMUP_EXPIRING_WITHIN_HOURS: int = 24
+    CACHE_WARMUP_MIN_REQUESTS: int = 3
+    CACHE_WARMUP_MAX_ENTRIES: int = 500
+    # Entries older than this are left to expire and be regenerated fresh
+    CACHE_WARMUP_MAX_AGE_HOURS: int = 7 * 24
+
+    # Content-addressed store for large stage outputs; an absolute path on storage
+    # shared by the API and every worker
+    ARTIFACT_STORE_PATH: str = "/var/lib/book-generator/artifacts"
+    # Outputs smaller than this stay inline in the database
+    ARTIFACT_INLINE_MAX_BYTES: int = 64 * 1024
+    # scripts/gc_artifacts.py keeps unreferenced artifacts younger than this
+    ARTIFACT_GC_GRACE_SECONDS: int = 3600
+
+    # Per-subscriber SSE queues; overflow policy is drop_oldest, coalesce_progress or disconnect
+    EVENT_QUEUE_MAX_SIZE: int = 256
+    EVENT_OVERFLOW_POLICY: str = "coalesce_progress"
+    # Recent events kept per book for clients resuming with Last-Event-ID
+    EVENT_REPLAY_BUFFER_SIZE: int = 512
+    EVENT_REPLAY_MAX_BOOKS: int = 1000
+    # publish(coalesce=True) merges streamed progress per book for this long, or until this many delta bytes
+    EVENT_COALESCE_WINDOW_MS: int = 50
+    EVENT_COALESCE_MAX_BYTES: int = 16 * 1024
+    # Interval between SSE comment lines that keep idle connections open through proxies
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+    # "memory" for a single API process, "postgres" for LISTEN/NOTIFY across API and worker
+    # processes; app.worker refuses to start with "memory"
+    EVENT_BROKER: str = "memory"
+    EVENT_BROKER_URL: Optional[str] = None  # defaults to DATABASE_URL
+    EVENT_BROKER_CHANNEL: str = "book_events"
     
     class Config:
         env_file = ".env"
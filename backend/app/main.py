@@ -2,6 +2,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import books, events
 from .database import Base, engine
+from .services.client_pool import client_pool
+from .services.supabase_executor import supabase_executor
+from .services.event_service import event_service
+from .services.coalescing_service import coalescing_service
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -25,6 +29,18 @@ app.add_middleware(
 app.include_router(books.router)
 app.include_router(events.router)
 
+@app.on_event("startup")
+async def start_event_broker():
+    await event_service.start()
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    # Let finished generations cache their results before the clients go away
+    await coalescing_service.drain()
+    await event_service.stop()
+    await client_pool.close()
+    supabase_executor.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "Book Generator API is running"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Enum, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 import enum
@@ -11,6 +11,12 @@ class BookStatus(str, enum.Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
 class Book(Base):
     __tablename__ = "books"
 
@@ -25,4 +31,37 @@ class Book(Base):
     content = Column(JSON, nullable=True)
     status = Column(Enum(BookStatus), default=BookStatus.DRAFT)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+    # At most one queued or running job per book, so concurrent enqueues cannot both insert
+    __table_args__ = (
+        Index(
+            "uq_generation_jobs_active_book", "book_id", unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+            sqlite_where=text("status IN ('QUEUED', 'RUNNING')")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    book_id = Column(Integer, ForeignKey("books.id"), index=True)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, index=True)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    worker_id = Column(String, nullable=True)
+    # A running job whose visibility timeout lapses is picked up by another worker
+    visible_at = Column(DateTime, default=datetime.utcnow, index=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class GenerationCheckpoint(Base):
+    __tablename__ = "generation_checkpoints"
+    __table_args__ = (UniqueConstraint("book_id", "stage", name="uq_generation_checkpoints_book_stage"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    book_id = Column(Integer, ForeignKey("books.id"), index=True)
+    stage = Column(String, nullable=False)
+    output = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
@@ -12,6 +12,11 @@ class MetricType(str, Enum):
     QUALITY_SCORE = "quality_score"
     CACHE_INVALIDATION = "cache_invalidation"
     CACHE_SIZE = "cache_size"
+    LOCAL_CACHE_HIT = "local_cache_hit"
+    LOCAL_CACHE_MISS = "local_cache_miss"
+    CACHE_EVICTION = "cache_eviction"
+    COMPRESSION_RATIO = "compression_ratio"
+    DECODE_TIME = "decode_time"
 
 class AnalyticsEvent(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
@@ -34,6 +39,13 @@ class CacheMetrics(BaseModel):
     misses: int = 0
     avg_validity_hours: float = 0
     storage_bytes: int = 0
+    local_hits: int = 0
+    local_misses: int = 0
+    evictions: int = 0
+    compressed_entries: int = 0
+    avg_compression_ratio: float = 0
+    decodes: int = 0
+    avg_decode_ms: float = 0
     invalidation_reason: Optional[str] = None
 
 class GenerationMetrics(BaseModel):
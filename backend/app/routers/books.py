@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
 from ..services.book_service import BookService
+from ..services.job_queue import JobQueue
+from ..services.artifact_store import ARTIFACT_KEY, ArtifactMissingError, artifact_store
 from ..schemas import Book, BookCreate
-from ..models import BookStatus
+from ..models import Book as BookModel, BookStatus
 
 router = APIRouter(
     prefix="/books",
@@ -32,20 +35,42 @@ async def create_book(book: BookCreate, db: Session = Depends(get_db)):
 @router.post("/{book_id}/generate", status_code=202,
     summary="Start book generation",
     description="Start the AI-powered generation process for a book")
-async def generate_book(
-    book_id: int,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
+async def generate_book(book_id: int, db: Session = Depends(get_db)):
     """
-    Initiate the book generation process:
+    Queue the book generation process for a worker:
     - Generates book structure using GPT-4
     - Creates content using Claude
     - Updates book status throughout the process
+
+    Repeated requests while a generation is pending return the same job.
+    Progress is streamed on /events/{book_id} via the cross-process event broker.
     """
-    service = BookService(db)
-    background_tasks.add_task(service.generate_book, book_id)
-    return {"message": "Book generation started"}
+    try:
+        job = await JobQueue(db).enqueue(book_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return {"message": "Book generation queued", "job_id": job.id, "status": job.status}
+
+@router.get("/jobs/{job_id}", response_model=dict,
+    summary="Get generation job status",
+    description="Check the status of a queued book generation job")
+async def get_job_status(job_id: int, db: Session = Depends(get_db)):
+    """
+    Returns the state of a generation job:
+    - **status**: Job status (queued, running, completed, failed)
+    - **attempts**: Number of times a worker has picked up the job
+    - **error**: Last failure message, if any
+    """
+    job = JobQueue(db).get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job.id,
+        "book_id": job.book_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error
+    }
 
 @router.get("/{book_id}/status", response_model=dict,
     summary="Get book generation status",
@@ -59,7 +84,35 @@ async def get_book_status(book_id: int, db: Session = Depends(get_db)):
     book = db.query(Book).filter(Book.id == book_id).first()
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
+    try:
+        content = artifact_store.resolve(book.content) if book.status == BookStatus.COMPLETED else None
+    except ArtifactMissingError:
+        raise HTTPException(status_code=410, detail="Book content is no longer available")
     return {
         "status": book.status,
-        "content": book.content if book.status == BookStatus.COMPLETED else None
-    }
\ No newline at end of file
+        "content": content
+    }
+
+@router.get("/{book_id}/content",
+    summary="Download book manuscript",
+    description="Stream the completed manuscript as plain text")
+async def get_book_content(book_id: int, db: Session = Depends(get_db)):
+    """
+    Streams the final manuscript straight from the artifact store, so large
+    books are never decoded into a single string in the API process.
+    """
+    book = db.query(BookModel).filter(BookModel.id == book_id).first()
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+    if book.status != BookStatus.COMPLETED or not book.content:
+        raise HTTPException(status_code=409, detail="Book generation has not completed")
+
+    manuscript = book.content.get("content")
+    if not artifact_store.is_ref(manuscript):
+        return StreamingResponse(iter([manuscript or ""]), media_type="text/plain; charset=utf-8")
+    if not artifact_store.exists(manuscript[ARTIFACT_KEY]):
+        raise HTTPException(status_code=410, detail="Book content is no longer available")
+    return StreamingResponse(
+        artifact_store.iter_text(manuscript[ARTIFACT_KEY]),
+        media_type="text/plain; charset=utf-8"
+    )
\ No newline at end of file
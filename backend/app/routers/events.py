@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse
+from ..core.config import settings
 from ..services.event_service import event_service
+from typing import Optional
 import asyncio
 
 router = APIRouter(
@@ -8,23 +10,41 @@ router = APIRouter(
     tags=["events"]
 )
 
-async def event_generator(request: Request, book_id: int):
-    queue = await event_service.subscribe(book_id)
+def _last_event_id(request: Request) -> Optional[int]:
+    """Id sent by a reconnecting EventSource, if any"""
+    try:
+        return int(request.headers["last-event-id"])
+    except (KeyError, ValueError):
+        return None
+
+async def event_generator(book_id: int, last_event_id: Optional[int] = None):
+    # StreamingResponse cancels this generator as soon as the client disconnects,
+    # so the subscription is released in `finally` without polling for it
+    subscription = await event_service.subscribe(book_id, last_event_id)
     try:
         while True:
-            if await request.is_disconnected():
-                break
             try:
-                data = await asyncio.wait_for(queue.get(), timeout=60)
-                yield f"data: {data}\n\n"
+                event = await asyncio.wait_for(subscription.get(), timeout=settings.SSE_KEEPALIVE_SECONDS)
             except asyncio.TimeoutError:
-                yield f"data: {{}}\n\n"  # Keep-alive
+                yield ": keep-alive\n\n"  # Comment lines are ignored by EventSource
+                continue
+            if event is None:
+                # Dropped by the overflow policy for falling too far behind
+                break
+            event_id, data = event
+            yield f"id: {event_id}\ndata: {data}\n\n"
     finally:
-        await event_service.unsubscribe(book_id, queue)
+        await event_service.unsubscribe(book_id, subscription)
+
+@router.get("/metrics", response_model=dict)
+async def get_event_metrics():
+    """Subscriber queue depths and overflow counters"""
+    return event_service.metrics()
 
 @router.get("/{book_id}")
 async def subscribe_to_events(request: Request, book_id: int):
     return StreamingResponse(
-        event_generator(request, book_id),
-        media_type="text/event-stream"
+        event_generator(book_id, _last_event_id(request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
\ No newline at end of file
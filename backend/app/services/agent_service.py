@@ -15,6 +15,9 @@ from app.services.openai_service import OpenAIService
 from app.services.cache_service import cache_service
 from app.services.retry_service import retry_service
 from app.services.analytics_service import analytics_service
+from app.services.checkpoint_service import checkpoint_service
+from app.services.similarity_cache import similarity_cache
+from app.services.coalescing_service import coalescing_service
 
 class AgentService:
     def __init__(self):
@@ -41,25 +44,39 @@ class AgentService:
         start_time = time.time()
 
         # Outliner Phase
-        outline = await self._run_outliner(state, background_tasks)
+        outline = await self._resume_or_run(
+            book_id, state, AgentType.OUTLINER,
+            lambda: self._run_outliner(state, background_tasks)
+        )
         if not outline:
             return
 
         # Writer Phase
-        draft = await self._run_writer(state, outline, background_tasks)
+        draft = await self._resume_or_run(
+            book_id, state, AgentType.WRITER,
+            lambda: self._run_writer(state, outline, background_tasks)
+        )
         if not draft:
             return
 
         # Editor Phase
-        edited = await self._run_editor(state, draft, background_tasks)
+        edited = await self._resume_or_run(
+            book_id, state, AgentType.EDITOR,
+            lambda: self._run_editor(state, draft, background_tasks)
+        )
         if not edited:
             return
 
         # Critic Phase
-        final = await self._run_critic(state, edited, background_tasks)
+        final = await self._resume_or_run(
+            book_id, state, AgentType.CRITIC,
+            lambda: self._run_critic(state, edited, background_tasks)
+        )
         if not final:
             return
 
+        await checkpoint_service.clear(book_id)
+
         # Track total generation time
         total_time = time.time() - start_time
         await analytics_service.track_event(
@@ -72,6 +89,25 @@ class AgentService:
         state.final_content = final
         yield self._format_event(state)
 
+    async def _resume_or_run(
+        self,
+        book_id: int,
+        state: BookGenerationState,
+        agent_type: AgentType,
+        operation
+    ) -> str | None:
+        """Reuse a stage checkpoint from an earlier failed run, or run the stage and checkpoint it"""
+        checkpoint = await checkpoint_service.load(book_id, agent_type.value)
+        if checkpoint is not None:
+            state.agents[agent_type].status = AgentStatus.COMPLETED
+            state.agents[agent_type].output = checkpoint
+            return checkpoint
+
+        output = await operation()
+        if output:
+            await checkpoint_service.save(book_id, agent_type.value, output)
+        return output
+
     async def _run_outliner(self, state: BookGenerationState, background_tasks: BackgroundTasks) -> str | None:
         state.current_agent = AgentType.OUTLINER
         state.agents[AgentType.OUTLINER].status = AgentStatus.RUNNING
@@ -87,6 +123,7 @@ class AgentService:
             state.agents[AgentType.OUTLINER].status = AgentStatus.COMPLETED
             state.agents[AgentType.OUTLINER].usingCache = True
             state.metrics.structure = score
+            similarity_cache.put(state.prompt, outline, score)
             
             # Track cache hit
             await analytics_service.track_event(
@@ -94,11 +131,34 @@ class AgentService:
                 metric_type=MetricType.CACHE_HIT,
                 value=1,
                 prompt=state.prompt,
+                additional_data={'match': 'exact'},
                 background_tasks=background_tasks
             )
             
             return outline
 
+        # Fall back to a near-duplicate prompt if the similarity cache is enabled
+        near_result = similarity_cache.get(state.prompt)
+        if near_result:
+            outline, score, similarity = near_result
+            state.agents[AgentType.OUTLINER].score = score
+            state.agents[AgentType.OUTLINER].output = outline
+            state.agents[AgentType.OUTLINER].status = AgentStatus.COMPLETED
+            state.agents[AgentType.OUTLINER].usingCache = True
+            state.metrics.structure = score
+
+            # Track near-match cache hit
+            await analytics_service.track_event(
+                agent_type=AgentType.OUTLINER,
+                metric_type=MetricType.CACHE_HIT,
+                value=1,
+                prompt=state.prompt,
+                additional_data={'match': 'near', 'similarity': similarity},
+                background_tasks=background_tasks
+            )
+
+            return outline
+
         # Track cache miss
         await analytics_service.track_event(
             agent_type=AgentType.OUTLINER,
@@ -113,41 +173,49 @@ class AgentService:
             score = await self.openai.evaluate_structure(outline)
             return outline, score
 
-        try:
-            outline, score = await retry_service.with_retry(
-                generate_with_score,
-                on_attempt=lambda attempt, delay: self._update_retry_status(
-                    state, AgentType.OUTLINER, attempt, delay
-                )
-            )
-            
+        async def record(result):
+            outline, score = result
             generation_time = time.time() - start_time
-            
-            # Track metrics
+
+            # Track metrics; flushed inline because the starting request may be gone by now
             await analytics_service.track_event(
                 agent_type=AgentType.OUTLINER,
                 metric_type=MetricType.GENERATION_TIME,
                 value=generation_time,
-                prompt=state.prompt,
-                background_tasks=background_tasks
+                prompt=state.prompt
             )
-            
+
             await analytics_service.track_event(
                 agent_type=AgentType.OUTLINER,
                 metric_type=MetricType.QUALITY_SCORE,
                 value=score,
-                prompt=state.prompt,
-                background_tasks=background_tasks
+                prompt=state.prompt
+            )
+
+            # Cache successful result
+            if score >= 9.5:
+                await cache_service.cache_result(state.prompt, AgentType.OUTLINER, outline, score)
+                similarity_cache.put(state.prompt, outline, score)
+
+        try:
+            # Identical concurrent requests share one generation and its score;
+            # the coalescer records metrics and caches it once per generation
+            outline, score = await coalescing_service.run(
+                AgentType.OUTLINER,
+                state.prompt,
+                lambda: retry_service.with_retry(
+                    generate_with_score,
+                    on_attempt=lambda attempt, delay: self._update_retry_status(
+                        state, AgentType.OUTLINER, attempt, delay
+                    )
+                ),
+                on_result=record
             )
             
             state.agents[AgentType.OUTLINER].score = score
             state.metrics.structure = score
             state.agents[AgentType.OUTLINER].status = AgentStatus.COMPLETED
             
-            # Cache successful result
-            if score >= 9.5:
-                await cache_service.cache_result(state.prompt, AgentType.OUTLINER, outline, score)
-            
             return outline
             
         except Exception as e:
@@ -205,39 +273,46 @@ class AgentService:
             score = await self.openai.evaluate_writing(draft)
             return draft, score
 
-        try:
-            draft, score = await retry_service.with_retry(
-                generate_with_score,
-                on_attempt=lambda attempt, delay: self._update_retry_status(
-                    state, AgentType.WRITER, attempt, delay
-                )
-            )
-            
+        async def record(result):
+            draft, score = result
             generation_time = time.time() - start_time
-            
+
             # Track metrics
             await analytics_service.track_event(
                 agent_type=AgentType.WRITER,
                 metric_type=MetricType.GENERATION_TIME,
                 value=generation_time,
-                prompt=outline,
-                background_tasks=background_tasks
+                prompt=outline
             )
-            
+
             await analytics_service.track_event(
                 agent_type=AgentType.WRITER,
                 metric_type=MetricType.QUALITY_SCORE,
                 value=score,
-                prompt=outline,
-                background_tasks=background_tasks
+                prompt=outline
+            )
+
+            await cache_service.cache_result(outline, AgentType.WRITER, draft, score)
+
+        try:
+            # Identical concurrent requests share one generation and its score;
+            # the coalescer records metrics and caches it once per generation
+            draft, score = await coalescing_service.run(
+                AgentType.WRITER,
+                outline,
+                lambda: retry_service.with_retry(
+                    generate_with_score,
+                    on_attempt=lambda attempt, delay: self._update_retry_status(
+                        state, AgentType.WRITER, attempt, delay
+                    )
+                ),
+                on_result=record
             )
             
             state.agents[AgentType.WRITER].score = score
             state.metrics.writing_quality = score
             state.agents[AgentType.WRITER].status = AgentStatus.COMPLETED
             
-            await cache_service.cache_result(outline, AgentType.WRITER, draft, score)
-            
             if score < 9.5:
                 return await self._run_editor(state, draft, background_tasks)
             
@@ -298,39 +373,46 @@ class AgentService:
             score = await self.openai.evaluate_technical(edited)
             return edited, score
 
-        try:
-            edited, score = await retry_service.with_retry(
-                generate_with_score,
-                on_attempt=lambda attempt, delay: self._update_retry_status(
-                    state, AgentType.EDITOR, attempt, delay
-                )
-            )
-            
+        async def record(result):
+            edited, score = result
             generation_time = time.time() - start_time
-            
+
             # Track metrics
             await analytics_service.track_event(
                 agent_type=AgentType.EDITOR,
                 metric_type=MetricType.GENERATION_TIME,
                 value=generation_time,
-                prompt=draft,
-                background_tasks=background_tasks
+                prompt=draft
             )
-            
+
             await analytics_service.track_event(
                 agent_type=AgentType.EDITOR,
                 metric_type=MetricType.QUALITY_SCORE,
                 value=score,
-                prompt=draft,
-                background_tasks=background_tasks
+                prompt=draft
+            )
+
+            await cache_service.cache_result(draft, AgentType.EDITOR, edited, score)
+
+        try:
+            # Identical concurrent requests share one generation and its score;
+            # the coalescer records metrics and caches it once per generation
+            edited, score = await coalescing_service.run(
+                AgentType.EDITOR,
+                draft,
+                lambda: retry_service.with_retry(
+                    generate_with_score,
+                    on_attempt=lambda attempt, delay: self._update_retry_status(
+                        state, AgentType.EDITOR, attempt, delay
+                    )
+                ),
+                on_result=record
             )
             
             state.agents[AgentType.EDITOR].score = score
             state.metrics.technical_aspects = score
             state.agents[AgentType.EDITOR].status = AgentStatus.COMPLETED
             
-            await cache_service.cache_result(draft, AgentType.EDITOR, edited, score)
-            
             if score < 9.5:
                 return await self._run_editor(state, edited, background_tasks)
             
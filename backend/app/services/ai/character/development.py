@@ -1,4 +1,3 @@
-```python
 from typing import Dict, Any, List
 from ..models.claude import ClaudeModel
 from ..models.gpt4 import GPT4Model
@@ -54,5 +53,4 @@ class CharacterDevelopment:
 
     def _generate_relationship_map(self, profiles: str) -> Dict[str, List[str]]:
         # Generate character relationship map
-        return {}
-```
\ No newline at end of file
+        return {}
\ No newline at end of file
@@ -1,4 +1,4 @@
-```python
+import asyncio
 from typing import Dict, Any, List
 from ..models.base import AIModel
 from ..models.claude import ClaudeModel
@@ -8,11 +8,13 @@ from ..research.market_analyzer import MarketAnalyzer
 from ..character.development import CharacterDevelopment
 from ..refinement.editor import ContentEditor
 from ..market.preparation import MarketPreparation
-from ...events.service import event_service
+from ..utils.chapters import split_chapters, chapter_heading
+from ..utils.streaming import generate_streaming
+from ...event_service import event_service
 from ....models import BookStatus
 
 class BookGenerationPipeline:
-    def __init__(self):
+    def __init__(self, parallel_chapters: bool = True, chapter_concurrency: int = 5):
         # Initialize AI models
         self.models = {
             'planning': GPT4Model(),
@@ -34,6 +36,10 @@ class BookGenerationPipeline:
         # Quality threshold
         self.quality_threshold = 9.8
 
+        # Chapter-parallel writing; outlines without "Chapter N:" headings are written in one pass
+        self.parallel_chapters = parallel_chapters
+        self.chapter_concurrency = chapter_concurrency
+
     async def generate_book(self, book_data: Dict[str, Any]) -> Dict[str, Any]:
         book_id = book_data["id"]
         try:
@@ -55,9 +61,18 @@ class BookGenerationPipeline:
 
             # 4. Initial Content Generation
             await self._emit_progress(book_id, "Generating initial content...")
-            content = await self.models['writing'].generate(
-                self._build_writing_prompt(outline, characters, book_data)
-            )
+            _, outline_chapters = split_chapters(outline)
+            if self.parallel_chapters and len(outline_chapters) > 1:
+                content = await self._write_chapters(
+                    book_id, outline, outline_chapters, characters, book_data
+                )
+            else:
+                content = await generate_streaming(
+                    book_id,
+                    self.models['writing'],
+                    self._build_writing_prompt(outline, characters, book_data),
+                    "Generating initial content..."
+                )
 
             # 5. Quality Improvement Loop
             quality_score = 0
@@ -74,10 +89,15 @@ class BookGenerationPipeline:
                         book_id, 
                         f"Improving quality (iteration {iteration + 1}, current score: {quality_score:.2f})..."
                     )
-                    content = await self.content_editor.refine_content(
+                    refined = await self.content_editor.refine_chapters(
                         content,
-                        {**book_data, "quality_feedback": quality_metrics}
+                        {**book_data, "quality_feedback": quality_metrics},
+                        self.quality_threshold
                     )
+                    if refined == content:
+                        # No chapter improved; scoring the same text again cannot help
+                        break
+                    content = refined
                 iteration += 1
 
             # 6. Market Preparation
@@ -99,6 +119,42 @@ class BookGenerationPipeline:
             await self._emit_error(book_id, str(e))
             raise
 
+    async def _write_chapters(
+        self,
+        book_id: int,
+        outline: str,
+        outline_chapters: List[str],
+        characters: Dict[str, Any],
+        book_data: Dict[str, Any]
+    ) -> str:
+        semaphore = asyncio.Semaphore(self.chapter_concurrency)
+        total = len(outline_chapters)
+        completed = 0
+
+        async def write_chapter(index: int, chapter_outline: str) -> str:
+            nonlocal completed
+            async with semaphore:
+                body = await generate_streaming(
+                    book_id,
+                    self.models['writing'],
+                    self._build_chapter_prompt(
+                        outline, chapter_outline, index, total, characters, book_data
+                    ),
+                    f"Writing chapter {index + 1} of {total}...",
+                    chapter=index
+                )
+            completed += 1
+            await self._emit_progress(
+                book_id, f"Writing chapters ({completed}/{total} complete)..."
+            )
+            return f"{chapter_heading(chapter_outline)}\n\n{body.strip()}"
+
+        chapters = await asyncio.gather(*[
+            write_chapter(index, chapter_outline)
+            for index, chapter_outline in enumerate(outline_chapters)
+        ])
+        return "\n\n".join(chapters)
+
     async def _emit_progress(self, book_id: int, message: str) -> None:
         await event_service.publish(book_id, {
             "status": BookStatus.GENERATING,
@@ -133,7 +189,8 @@ class BookGenerationPipeline:
         3. Key plot points
         4. Thematic elements
         5. World-building details
-        6. Market-driven elements"""
+        6. Market-driven elements
+        7. Chapter-by-chapter breakdown, each starting with a "Chapter N:" heading"""
 
     def _build_writing_prompt(
         self, 
@@ -151,4 +208,27 @@ class BookGenerationPipeline:
         - Follows {book_data['genre']} conventions
         - Creates deep character development
         - Builds emotional resonance"""
-```
\ No newline at end of file
+
+    def _build_chapter_prompt(
+        self,
+        outline: str,
+        chapter_outline: str,
+        index: int,
+        total: int,
+        characters: Dict[str, Any],
+        book_data: Dict[str, Any]
+    ) -> str:
+        return f"""Using this outline of the whole book: {outline}
+        And these character profiles: {characters}
+
+        Write chapter {index + 1} of {total}, covering only this part of the outline:
+        {chapter_outline}
+
+        The chapter must:
+        - Match the {book_data['style']} writing style
+        - Maintain a {book_data['tone']} tone
+        - Engage {book_data['target_audience']} readers
+        - Follow {book_data['genre']} conventions
+        - Pick up where the previous chapter leaves off and set up the next one
+
+        Return only the chapter prose, without the chapter heading."""
\ No newline at end of file
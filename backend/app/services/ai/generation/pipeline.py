@@ -1,9 +1,10 @@
-```python
 from typing import Dict, Any
+from ..models.base import AIModel
 from ..models.claude import ClaudeModel
 from ..models.gpt4 import GPT4Model
 from ..quality.evaluator import QualityEvaluator
-from ...events.service import event_service
+from ..utils.streaming import generate_streaming
+from ...event_service import event_service
 from ....models import BookStatus
 
 class GenerationPipeline:
@@ -18,22 +19,43 @@ class GenerationPipeline:
         ])
 
     async def generate(self, book_data: Dict[str, Any]) -> Dict[str, Any]:
+        outline = await self.plan(book_data)
+        return await self.write(book_data, outline)
+
+    async def plan(self, book_data: Dict[str, Any]) -> str:
+        """Planning phase on its own, so work that only needs the outline can start early"""
         book_id = book_data["id"]
-        
+
         try:
-            # Planning phase
             await event_service.publish(book_id, {
                 "status": BookStatus.GENERATING,
                 "progress": "Planning the story structure..."
             })
-            outline = await self.planner.generate(self._build_planning_prompt(book_data))
+            return await self.planner.generate(self._build_planning_prompt(book_data))
 
+        except Exception as e:
+            await event_service.publish(book_id, {
+                "status": BookStatus.FAILED,
+                "progress": f"Generation failed: {str(e)}"
+            })
+            raise
+
+    async def write(self, book_data: Dict[str, Any], outline: str) -> Dict[str, Any]:
+        """Writing, enhancement, review and evaluation of a planned book"""
+        book_id = book_data["id"]
+
+        try:
             # Writing phase
             await event_service.publish(book_id, {
                 "status": BookStatus.GENERATING,
                 "progress": "Writing initial content..."
             })
-            content = await self.writer.generate(self._build_writing_prompt(outline, book_data))
+            content = await generate_streaming(
+                book_id,
+                self.writer,
+                self._build_writing_prompt(outline, book_data),
+                "Writing initial content..."
+            )
 
             # Enhancement phase
             await event_service.publish(book_id, {
@@ -107,5 +129,4 @@ class GenerationPipeline:
         4. Thematic depth
         5. Overall impact
 
-        Content: {content}"""
-```
\ No newline at end of file
+        Content: {content}"""
\ No newline at end of file
@@ -1,5 +1,4 @@
-```python
-from typing import Dict, Any
+from typing import Dict, Any, List
 from ..models.claude import ClaudeModel
 from ..models.gpt4 import GPT4Model
 
@@ -57,5 +56,4 @@ class MarketPreparation:
 
     def _extract_channels(self, strategy: str) -> List[Dict[str, Any]]:
         # Extract and prioritize marketing channels
-        return []
-```
\ No newline at end of file
+        return []
\ No newline at end of file
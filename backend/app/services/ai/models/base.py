@@ -1,13 +1,15 @@
-```python
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 
 class AIModel(ABC):
     @abstractmethod
     async def generate(self, prompt: str) -> str:
         pass
 
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        # Models without native streaming yield the full completion as one delta
+        yield await self.generate(prompt)
+
     @abstractmethod
     async def analyze(self, content: str) -> Dict[str, float]:
-        pass
-```
\ No newline at end of file
+        pass
\ No newline at end of file
@@ -1,11 +1,10 @@
-```python
-from typing import Dict
-import anthropic
+from typing import Dict, AsyncIterator
 from .base import AIModel
+from ...client_pool import client_pool
 
 class ClaudeModel(AIModel):
     def __init__(self, model_name: str = "claude-3-opus-20240229"):
-        self.client = anthropic.Anthropic()
+        self.client = client_pool.anthropic
         self.model = model_name
 
     async def generate(self, prompt: str) -> str:
@@ -16,6 +15,15 @@ class ClaudeModel(AIModel):
         )
         return response.content
 
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=100000,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
     async def analyze(self, content: str) -> Dict[str, float]:
         response = await self.client.messages.create(
             model=self.model,
@@ -32,5 +40,4 @@ class ClaudeModel(AIModel):
 
     def _parse_scores(self, response: str) -> Dict[str, float]:
         # Implement score parsing logic
-        return {"literary": 0.0, "character": 0.0, "plot": 0.0}
-```
\ No newline at end of file
+        return {"literary": 0.0, "character": 0.0, "plot": 0.0}
\ No newline at end of file
@@ -1,11 +1,10 @@
-```python
-from typing import Dict
-import openai
+from typing import Dict, AsyncIterator
 from .base import AIModel
+from ...client_pool import client_pool
 
 class GPT4Model(AIModel):
     def __init__(self, model_name: str = "gpt-4-turbo-preview"):
-        self.client = openai.OpenAI()
+        self.client = client_pool.openai
         self.model = model_name
 
     async def generate(self, prompt: str) -> str:
@@ -15,6 +14,16 @@ class GPT4Model(AIModel):
         )
         return response.choices[0].message.content
 
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     async def analyze(self, content: str) -> Dict[str, float]:
         response = await self.client.chat.completions.create(
             model=self.model,
@@ -29,5 +38,4 @@ class GPT4Model(AIModel):
 
     def _parse_scores(self, response: str) -> Dict[str, float]:
         # Implement score parsing logic
-        return {"technical": 0.0, "emotional": 0.0, "dialogue": 0.0}
-```
\ No newline at end of file
+        return {"technical": 0.0, "emotional": 0.0, "dialogue": 0.0}
\ No newline at end of file
@@ -1,12 +1,14 @@
-```python
-from typing import Dict, Any
+from typing import Dict, Any, List
 from ..research.market_analyzer import MarketAnalyzer
 from ..character.development import CharacterDevelopment
 from ..generation.pipeline import GenerationPipeline
 from ..refinement.editor import ContentEditor
 from ..market.preparation import MarketPreparation
 from ..quality.evaluator import QualityEvaluator
-from ...events.service import event_service
+from ..models.claude import ClaudeModel
+from ..models.gpt4 import GPT4Model
+from .scheduler import Stage, StageScheduler
+from ...event_service import event_service
 from ....models import BookStatus
 
 class MasterPipeline:
@@ -16,44 +18,81 @@ class MasterPipeline:
         self.generation_pipeline = GenerationPipeline()
         self.content_editor = ContentEditor()
         self.market_prep = MarketPreparation()
-        self.quality_evaluator = QualityEvaluator([])
+        self.quality_evaluator = QualityEvaluator([ClaudeModel(), GPT4Model()])
         self.quality_threshold = 9.0
 
     async def generate_book(self, book_data: Dict[str, Any]) -> Dict[str, Any]:
         book_id = book_data["id"]
         try:
-            # 1. Market Research Phase
+            schedule = await StageScheduler(self._build_stages(book_data)).run()
+            results = schedule.results
+
+            await event_service.publish(book_id, {
+                "status": BookStatus.GENERATING,
+                "progress": f"Critical path: {' -> '.join(schedule.critical_path)} ({schedule.total_time:.1f}s)"
+            })
+
+            return {
+                "content": results["refinement"]["content"],
+                "structure": results["outline"],
+                "character_data": results["characters"],
+                "market_analysis": results["market_analysis"],
+                "market_materials": results["market_preparation"],
+                "quality_metrics": results["refinement"]["quality_metrics"],
+                "schedule": {
+                    "critical_path": schedule.critical_path,
+                    "durations": schedule.durations,
+                    "total_time": schedule.total_time
+                }
+            }
+
+        except Exception as e:
+            await event_service.publish(book_id, {
+                "status": BookStatus.FAILED,
+                "progress": f"Generation failed: {str(e)}"
+            })
+            raise
+
+    def _build_stages(self, book_data: Dict[str, Any]) -> List[Stage]:
+        book_id = book_data["id"]
+
+        # 1. Market Research Phase - independent of generation
+        async def market_analysis(inputs: Dict[str, Any]) -> Dict[str, Any]:
             await event_service.publish(book_id, {
                 "status": BookStatus.GENERATING,
                 "progress": "Analyzing market and trends..."
             })
-            market_analysis = await self.market_analyzer.analyze_market(book_data)
-            
-            # 2. Initial Generation
-            generation_result = await self.generation_pipeline.generate(book_data)
-            outline = generation_result["structure"]
-            initial_content = generation_result["content"]
-
-            # 3. Character Development
+            return await self.market_analyzer.analyze_market(book_data)
+
+        # 2. Story planning - the outline unblocks both writing and character development
+        async def outline(inputs: Dict[str, Any]) -> str:
+            return await self.generation_pipeline.plan(book_data)
+
+        # Initial Generation
+        async def generation(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.generation_pipeline.write(book_data, inputs["outline"])
+
+        # 3. Character Development - only needs the outline
+        async def characters(inputs: Dict[str, Any]) -> Dict[str, Any]:
             await event_service.publish(book_id, {
                 "status": BookStatus.GENERATING,
                 "progress": "Developing characters..."
             })
-            character_data = await self.character_developer.develop_characters(
-                outline, book_data["genre"]
+            return await self.character_developer.develop_characters(
+                inputs["outline"], book_data["genre"]
             )
 
-            # 4. Content Refinement
+        # 4. Content Refinement and 5. Quality Evaluation Loop
+        async def refinement(inputs: Dict[str, Any]) -> Dict[str, Any]:
             await event_service.publish(book_id, {
                 "status": BookStatus.GENERATING,
                 "progress": "Refining content..."
             })
             refined_content = await self.content_editor.refine_content(
-                initial_content, 
-                {**book_data, "character_data": character_data}
+                inputs["generation"]["content"],
+                {**book_data, "character_data": inputs["characters"]}
             )
 
-            # 5. Quality Evaluation Loop
             quality_score = 0
             iteration = 0
             max_iterations = 3
@@ -67,34 +106,34 @@ class MasterPipeline:
                         "status": BookStatus.GENERATING,
                         "progress": f"Improving quality (iteration {iteration + 1})..."
                     })
-                    refined_content = await self.content_editor.refine_content(
-                        refined_content, 
-                        {**book_data, "quality_feedback": quality_metrics}
+                    improved_content = await self.content_editor.refine_chapters(
+                        refined_content,
+                        {**book_data, "quality_feedback": quality_metrics},
+                        self.quality_threshold
                     )
+                    if improved_content == refined_content:
+                        # No chapter improved; scoring the same text again cannot help
+                        break
+                    refined_content = improved_content
                 iteration += 1
 
-            # 6. Market Preparation
+            return {"content": refined_content, "quality_metrics": quality_metrics}
+
+        # 6. Market Preparation
+        async def market_preparation(inputs: Dict[str, Any]) -> Dict[str, Any]:
             await event_service.publish(book_id, {
                 "status": BookStatus.GENERATING,
                 "progress": "Preparing market materials..."
             })
-            market_materials = await self.market_prep.prepare_for_market(
-                book_data, refined_content
+            return await self.market_prep.prepare_for_market(
+                book_data, inputs["refinement"]["content"]
             )
 
-            return {
-                "content": refined_content,
-                "structure": outline,
-                "character_data": character_data,
-                "market_analysis": market_analysis,
-                "market_materials": market_materials,
-                "quality_metrics": quality_metrics
-            }
-
-        except Exception as e:
-            await event_service.publish(book_id, {
-                "status": BookStatus.FAILED,
-                "progress": f"Generation failed: {str(e)}"
-            })
-            raise
-```
\ No newline at end of file
+        return [
+            Stage("market_analysis", market_analysis),
+            Stage("outline", outline),
+            Stage("generation", generation, inputs=["outline"]),
+            Stage("characters", characters, inputs=["outline"]),
+            Stage("refinement", refinement, inputs=["generation", "characters"]),
+            Stage("market_preparation", market_preparation, inputs=["refinement"])
+        ]
\ No newline at end of file
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Callable, Awaitable
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    inputs: List[str] = field(default_factory=list)
+
+@dataclass
+class ScheduleResult:
+    results: Dict[str, Any]
+    durations: Dict[str, float]
+    critical_path: List[str]
+    total_time: float
+
+class StageScheduler:
+    """Runs pipeline stages as a DAG, starting each stage once its inputs are done"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        self._order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        visiting: set = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle at '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].inputs:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    async def run(self) -> ScheduleResult:
+        started = time.monotonic()
+        finished_at: Dict[str, float] = {}
+        durations: Dict[str, float] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> Any:
+            inputs = await asyncio.gather(*[tasks[name] for name in stage.inputs])
+            stage_start = time.monotonic()
+            result = await stage.run(dict(zip(stage.inputs, inputs)))
+            finished_at[stage.name] = time.monotonic() - started
+            durations[stage.name] = finished_at[stage.name] - (stage_start - started)
+            return result
+
+        # Tasks are created in dependency order so every input task already exists
+        for name in self._order:
+            tasks[name] = asyncio.create_task(run_stage(self.stages[name]))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return ScheduleResult(
+            results={name: task.result() for name, task in tasks.items()},
+            durations=durations,
+            critical_path=self._critical_path(finished_at),
+            total_time=time.monotonic() - started
+        )
+
+    def _critical_path(self, finished_at: Dict[str, float]) -> List[str]:
+        """Walk back from the last stage to finish through its latest-finishing input"""
+        path: List[str] = []
+        current = max(finished_at, key=finished_at.get) if finished_at else None
+        while current is not None:
+            path.append(current)
+            inputs = self.stages[current].inputs
+            current = max(inputs, key=lambda name: finished_at[name]) if inputs else None
+        return list(reversed(path))
\ No newline at end of file
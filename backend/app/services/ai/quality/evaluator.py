@@ -1,23 +1,64 @@
-```python
-from typing import Dict, List
+import asyncio
+from typing import Dict, List, Optional, Union
 from ..models.base import AIModel
+from ..utils.cache import ContentCache
+
+class EvaluationError(Exception):
+    """Raised when no judge produced a score"""
 
 class QualityEvaluator:
-    def __init__(self, models: List[AIModel]):
+    def __init__(self, models: List[AIModel], timeout: Union[float, List[float]] = 120.0):
+        if not models:
+            raise ValueError("QualityEvaluator needs at least one judge model")
         self.models = models
+        # One timeout per judge; a single value applies to all of them
+        if isinstance(timeout, list) and len(timeout) != len(models):
+            raise ValueError(f"Got {len(timeout)} timeouts for {len(models)} judges")
+        self.timeouts = timeout if isinstance(timeout, list) else [timeout] * len(models)
         self.weights = {
             "technical": 0.3,
             "literary": 0.4,
             "emotional": 0.3
         }
+        # Refinement loops re-score unchanged chapters; reuse their earlier evaluation
+        self.cache = ContentCache(max_bytes=1024 * 1024)
+        self._cache_context = {
+            "judges": [type(model).__name__ for model in models],
+            "weights": self.weights
+        }
 
     async def evaluate(self, content: str) -> Dict[str, float]:
-        scores = []
-        for model in self.models:
-            model_scores = await model.analyze(content)
-            scores.append(model_scores)
+        content_hash = ContentCache.hash_content(content)
+        cached = self.cache.get_cached_content(content, self._cache_context, content_hash)
+        if cached is not None:
+            return dict(cached)
+
+        results = await asyncio.gather(*[
+            self._analyze_with_timeout(model, timeout, content)
+            for model, timeout in zip(self.models, self.timeouts)
+        ])
+        scores = [model_scores for model_scores in results if model_scores is not None]
+        if not scores:
+            # A 0 here would be indistinguishable from a genuinely bad score
+            raise EvaluationError(f"All {len(self.models)} judges failed to score the content")
+
+        final_scores = self._calculate_final_score(scores)
+        self.cache.cache_content(content, self._cache_context, final_scores, content_hash)
+        return dict(final_scores)
 
-        return self._calculate_final_score(scores)
+    async def _analyze_with_timeout(
+        self,
+        model: AIModel,
+        timeout: float,
+        content: str
+    ) -> Optional[Dict[str, float]]:
+        try:
+            return await asyncio.wait_for(model.analyze(content), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"{type(model).__name__} timed out after {timeout}s, dropping from evaluation")
+        except Exception as e:
+            print(f"{type(model).__name__} evaluation failed, dropping from evaluation: {e}")
+        return None
 
     def _calculate_final_score(self, scores: List[Dict[str, float]]) -> Dict[str, float]:
         final_scores = {}
@@ -26,5 +67,4 @@ class QualityEvaluator:
             final_scores[category] = sum(category_scores) / len(category_scores) * weight
 
         final_scores["overall"] = sum(final_scores.values())
-        return final_scores
-```
\ No newline at end of file
+        return final_scores
\ No newline at end of file
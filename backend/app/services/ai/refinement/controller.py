@@ -0,0 +1,107 @@
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+class StopReason(Enum):
+    THRESHOLD_REACHED = "threshold_reached"
+    MAX_ITERATIONS = "max_iterations"
+    TOKEN_BUDGET = "token_budget"
+    TIME_BUDGET = "time_budget"
+    PLATEAU = "plateau"
+
+@dataclass
+class RefinementResult:
+    content: str
+    score: Optional[float]
+    iterations: int
+    tokens_used: int
+    elapsed_seconds: float
+    stop_reason: StopReason
+
+def estimate_tokens(*texts: str) -> int:
+    # Rough English average of ~4 characters per token
+    return sum(len(text) for text in texts) // 4
+
+class RefinementController:
+    """Decides when a refinement loop should stop and keeps the best version seen"""
+
+    def __init__(
+        self,
+        quality_threshold: float = 9.0,
+        max_iterations: int = 3,
+        token_budget: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        epsilon: float = 0.05,
+        patience: int = 1
+    ):
+        self.quality_threshold = quality_threshold
+        self.max_iterations = max_iterations
+        self.token_budget = token_budget
+        self.time_budget = time_budget
+        self.epsilon = epsilon
+        self.patience = patience
+
+    def start(self, content: str, score: Optional[float] = None) -> None:
+        self.best_content = content
+        self.best_score = score
+        self.last_score = score
+        self.iterations = 0
+        self.tokens_used = 0
+        self.last_iteration_tokens = 0
+        self.last_iteration_seconds = 0.0
+        self.stalled_iterations = 0
+        self.started_at = time.monotonic()
+        self._iteration_started_at = self.started_at
+        self.stop_reason: Optional[StopReason] = None
+
+    def record(self, content: str, score: float, tokens: int) -> None:
+        """Record the outcome of one refinement iteration"""
+        now = time.monotonic()
+        self.iterations += 1
+        self.tokens_used += tokens
+        self.last_iteration_tokens = tokens
+        self.last_iteration_seconds = now - self._iteration_started_at
+        self._iteration_started_at = now
+
+        if self.last_score is not None and score - self.last_score < self.epsilon:
+            self.stalled_iterations += 1
+        else:
+            self.stalled_iterations = 0
+        self.last_score = score
+
+        if self.best_score is None or score > self.best_score:
+            self.best_content = content
+            self.best_score = score
+
+    def should_stop(self) -> Optional[StopReason]:
+        """Return why the loop should stop before the next iteration, if it should"""
+        # Callers ask for refinement, so at least one pass always runs
+        if self.iterations and self.best_score >= self.quality_threshold:
+            self.stop_reason = StopReason.THRESHOLD_REACHED
+        elif self.iterations >= self.max_iterations:
+            self.stop_reason = StopReason.MAX_ITERATIONS
+        elif self.iterations and self.stalled_iterations >= self.patience:
+            self.stop_reason = StopReason.PLATEAU
+        # Budgets assume the next iteration costs about as much as the last one
+        elif (self.token_budget is not None and
+              self.tokens_used + self.last_iteration_tokens > self.token_budget):
+            self.stop_reason = StopReason.TOKEN_BUDGET
+        elif (self.time_budget is not None and
+              self.elapsed_seconds + self.last_iteration_seconds > self.time_budget):
+            self.stop_reason = StopReason.TIME_BUDGET
+        return self.stop_reason
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def result(self) -> RefinementResult:
+        return RefinementResult(
+            content=self.best_content,
+            score=self.best_score,
+            iterations=self.iterations,
+            tokens_used=self.tokens_used,
+            elapsed_seconds=self.elapsed_seconds,
+            stop_reason=self.stop_reason
+        )
\ No newline at end of file
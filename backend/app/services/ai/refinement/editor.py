@@ -1,36 +1,112 @@
-```python
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Optional
 from ..models.claude import ClaudeModel
 from ..models.gpt4 import GPT4Model
 from ..quality.evaluator import QualityEvaluator
+from ..utils.chapters import (
+    chapter_body, chapters_to_refine, replace_chapter_body, replace_chapters, split_chapters
+)
+from .controller import RefinementController, RefinementResult, estimate_tokens
 
 class ContentEditor:
-    def __init__(self):
+    def __init__(
+        self,
+        max_iterations: int = 3,
+        token_budget: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        epsilon: float = 0.05
+    ):
         self.main_editor = ClaudeModel()
         self.style_editor = GPT4Model()
         self.evaluator = QualityEvaluator([ClaudeModel(), GPT4Model()])
         self.quality_threshold = 9.0
+        self.max_iterations = max_iterations
+        self.token_budget = token_budget
+        self.time_budget = time_budget
+        self.epsilon = epsilon
 
     async def refine_content(self, content: str, metadata: Dict[str, Any]) -> str:
-        refined_content = content
-        quality_score = 0
+        result = await self.refine(content, metadata)
+        return result.content
 
-        while quality_score < self.quality_threshold:
+    async def refine(self, content: str, metadata: Dict[str, Any]) -> RefinementResult:
+        controller = RefinementController(
+            quality_threshold=self.quality_threshold,
+            max_iterations=self.max_iterations,
+            token_budget=self.token_budget,
+            time_budget=self.time_budget,
+            epsilon=self.epsilon
+        )
+        # A score from an earlier evaluation lets the original compete as best version
+        controller.start(content, (metadata.get("quality_feedback") or {}).get("overall"))
+
+        while not controller.should_stop():
+            # Each pass starts from the best version so far
+            editing_prompt = self._build_editing_prompt(controller.best_content, metadata)
             # Main editing pass
-            refined_content = await self.main_editor.generate(
-                self._build_editing_prompt(refined_content, metadata)
-            )
+            edited_content = await self.main_editor.generate(editing_prompt)
 
             # Style enhancement
-            refined_content = await self.style_editor.generate(
-                self._build_style_prompt(refined_content, metadata)
-            )
+            style_prompt = self._build_style_prompt(edited_content, metadata)
+            refined_content = await self.style_editor.generate(style_prompt)
 
             # Evaluate quality
             quality_metrics = await self.evaluator.evaluate(refined_content)
-            quality_score = quality_metrics["overall"]
+            controller.record(
+                refined_content,
+                quality_metrics["overall"],
+                estimate_tokens(editing_prompt, edited_content, style_prompt, refined_content)
+            )
+
+        # Returned rather than stored: refine_chapters runs several refinements at once
+        result = controller.result()
+        print(
+            f"Refinement stopped ({result.stop_reason.value}) after "
+            f"{result.iterations} iterations, best score {result.score}"
+        )
+        return result
+
+    async def score_chapters(self, content: str) -> List[Dict[str, float]]:
+        """Evaluate every chapter of the content independently"""
+        _, chapters = split_chapters(content)
+        return await asyncio.gather(*[
+            self.evaluator.evaluate(chapter) for chapter in chapters
+        ])
 
-        return refined_content
+    async def refine_chapters(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        threshold: Optional[float] = None
+    ) -> str:
+        """Refine only the chapters scoring below threshold, leaving the rest untouched.
+
+        When every chapter clears the threshold but the book as a whole did
+        not, the lowest scoring chapter is refined so the caller's loop progresses.
+        """
+        threshold = self.quality_threshold if threshold is None else threshold
+        preamble, chapters = split_chapters(content)
+        if len(chapters) < 2:
+            return await self.refine_content(content, metadata)
+
+        chapter_scores = await self.score_chapters(content)
+        weak_chapters = chapters_to_refine(chapter_scores, threshold)
+        print(f"Refining {len(weak_chapters)} of {len(chapters)} chapters (threshold {threshold})")
+
+        refined_chapters = await asyncio.gather(*[
+            self._refine_chapter(chapters[index], metadata, chapter_scores[index])
+            for index in weak_chapters
+        ])
+        return replace_chapters(preamble, chapters, dict(zip(weak_chapters, refined_chapters)))
+
+    async def _refine_chapter(
+        self,
+        chapter: str,
+        metadata: Dict[str, Any],
+        scores: Dict[str, float]
+    ) -> str:
+        result = await self.refine(chapter_body(chapter), {**metadata, "quality_feedback": scores})
+        return replace_chapter_body(chapter, result.content)
 
     def _build_editing_prompt(self, content: str, metadata: Dict[str, Any]) -> str:
         return f"""Refine this content for maximum impact:
@@ -56,5 +132,4 @@ class ContentEditor:
         3. Emotional impact
         4. Sensory details
 
-        Content: {content}"""
-```
\ No newline at end of file
+        Content: {content}"""
\ No newline at end of file
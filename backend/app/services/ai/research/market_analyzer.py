@@ -1,4 +1,3 @@
-```python
 from typing import Dict, Any
 from ..models.claude import ClaudeModel
 from ..models.gpt4 import GPT4Model
@@ -45,5 +44,4 @@ class MarketAnalyzer:
 
     def _extract_segments(self, market_research: str, trend_analysis: str) -> list:
         # Extract target market segments from analysis
-        return []
-```
\ No newline at end of file
+        return []
\ No newline at end of file
@@ -1,27 +1,173 @@
-```python
-from typing import Dict, Any
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Any, Optional
 import hashlib
 import json
+import time
 
-class ContentCache:
+class EvictionPolicy(ABC):
+    @abstractmethod
+    def on_insert(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def on_access(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def on_remove(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def victim(self) -> str:
+        pass
+
+class LRUPolicy(EvictionPolicy):
     def __init__(self):
-        self._cache: Dict[str, Any] = {}
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def on_insert(self, key: str) -> None:
+        self._order[key] = None
+
+    def on_access(self, key: str) -> None:
+        self._order.move_to_end(key)
+
+    def on_remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> str:
+        return next(iter(self._order))
+
+class LFUPolicy(EvictionPolicy):
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        # Keys grouped by access count, oldest first within a count
+        self._buckets: Dict[int, OrderedDict[str, None]] = {}
+        self._min_count = 0
+
+    def on_insert(self, key: str) -> None:
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def on_access(self, key: str) -> None:
+        count = self._counts[key]
+        self._discard(key, count)
+        if count == self._min_count and count not in self._buckets:
+            self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
 
-    def get_cached_content(self, content: str, context: Dict[str, Any]) -> Dict[str, Any] | None:
-        cache_key = self._generate_cache_key(content, context)
-        return self._cache.get(cache_key)
+    def on_remove(self, key: str) -> None:
+        count = self._counts.pop(key, None)
+        if count is not None:
+            self._discard(key, count)
+            if count == self._min_count and count not in self._buckets:
+                self._min_count = min(self._buckets, default=0)
 
-    def cache_content(self, content: str, context: Dict[str, Any], result: Dict[str, Any]) -> None:
-        cache_key = self._generate_cache_key(content, context)
-        self._cache[cache_key] = result
+    def victim(self) -> str:
+        return next(iter(self._buckets[self._min_count]))
 
-    def _generate_cache_key(self, content: str, context: Dict[str, Any]) -> str:
+    def _discard(self, key: str, count: int) -> None:
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+
+class ContentCache:
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 3600,
+        policy: Optional[EvictionPolicy] = None
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.policy = policy or LRUPolicy()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (result, size in bytes, expiry on the monotonic clock)
+        self._cache: Dict[str, tuple[Dict[str, Any], int, Optional[float]]] = {}
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """Hash content once so callers can reuse it across lookups"""
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get_cached_content(
+        self,
+        content: str,
+        context: Dict[str, Any],
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any] | None:
+        cache_key = self._generate_cache_key(content_hash or self.hash_content(content), context)
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        result, _, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(cache_key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.policy.on_access(cache_key)
+        self.hits += 1
+        return result
+
+    def cache_content(
+        self,
+        content: str,
+        context: Dict[str, Any],
+        result: Dict[str, Any],
+        content_hash: Optional[str] = None
+    ) -> None:
+        cache_key = self._generate_cache_key(content_hash or self.hash_content(content), context)
+        size = len(json.dumps(result, default=str).encode())
+        if size > self.max_bytes:
+            return
+        if cache_key in self._cache:
+            self._remove(cache_key)
+
+        while self.size_bytes + size > self.max_bytes:
+            self._remove(self.policy.victim())
+            self.evictions += 1
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        self._cache[cache_key] = (result, size, expires_at)
+        self.size_bytes += size
+        self.policy.on_insert(cache_key)
+
+    def _generate_cache_key(self, content_hash: str, context: Dict[str, Any]) -> str:
+        # Only the small context is serialized; the content is represented by its hash
         combined = json.dumps({
-            "content": content,
+            "content_hash": content_hash,
             "context": context
         }, sort_keys=True)
         return hashlib.sha256(combined.encode()).hexdigest()
 
+    def _remove(self, cache_key: str) -> None:
+        _, size, _ = self._cache.pop(cache_key)
+        self.size_bytes -= size
+        self.policy.on_remove(cache_key)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._cache),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
     def clear(self) -> None:
         self._cache.clear()
-```
\ No newline at end of file
+        self.size_bytes = 0
+        policy_type = type(self.policy)
+        self.policy = policy_type()
\ No newline at end of file
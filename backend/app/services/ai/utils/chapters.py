@@ -0,0 +1,70 @@
+import re
+from typing import Dict, List, Sequence, Tuple
+
+_NUMBER_WORD = (
+    r"(?:one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|"
+    r"fifteen|sixteen|seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|"
+    r"eighty|ninety|hundred)"
+)
+_ROMAN = r"(?=[ivxlcdm])m{0,3}(?:cm|cd|d?c{0,3})(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3})"
+
+# Matches "Chapter 3", "## Chapter Twenty-One: ...", "**CHAPTER IV**" at the start of a line.
+# The number must end the line or be followed by ":", "." or a dash, so prose such as
+# "Chapter after chapter..." or a "Chapter breakdown:" header is not a chapter.
+CHAPTER_HEADING = re.compile(
+    rf"^[ \t]*(?:#{{1,6}}[ \t]*)?(?:\*\*)?chapter[ \t]+"
+    rf"(?:\d+|{_ROMAN}|{_NUMBER_WORD}(?:[- ]{_NUMBER_WORD})?)"
+    r"(?:\*\*)?[ \t]*(?:[:.\-\u2013\u2014]|\*\*|$)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+def split_chapters(text: str) -> Tuple[str, List[str]]:
+    """Split text on chapter headings into (preamble, chapters).
+
+    The split is lossless: preamble + "".join(chapters) == text.
+    """
+    starts = [match.start() for match in CHAPTER_HEADING.finditer(text)]
+    if not starts:
+        return text, []
+
+    preamble = text[:starts[0]]
+    chapters = [
+        text[start:end]
+        for start, end in zip(starts, starts[1:] + [len(text)])
+    ]
+    return preamble, chapters
+
+def chapter_heading(chapter: str) -> str:
+    """Return the heading line of a chapter segment"""
+    return chapter.strip().splitlines()[0].strip() if chapter.strip() else ""
+
+def chapter_body(chapter: str) -> str:
+    """Text of a chapter segment below its heading line, stripped"""
+    return chapter.partition("\n")[2].strip()
+
+def replace_chapter_body(chapter: str, body: str) -> str:
+    """Swap in a new body, keeping the heading line and surrounding whitespace so chapters splice back cleanly"""
+    heading, _, old_body = chapter.partition("\n")
+    leading = old_body[:len(old_body) - len(old_body.lstrip())]
+    trailing = old_body[len(old_body.rstrip()):]
+    return f"{heading}\n{leading}{body.strip()}{trailing}"
+
+def chapters_below(scores: Sequence[Dict[str, float]], threshold: float) -> List[int]:
+    """Indexes of chapters whose overall score is below threshold"""
+    return [index for index, chapter_scores in enumerate(scores) if chapter_scores["overall"] < threshold]
+
+def chapters_to_refine(scores: Sequence[Dict[str, float]], threshold: float, fallback: int = 1) -> List[int]:
+    """Chapters below threshold, or else the `fallback` lowest scoring ones.
+
+    Callers only refine chapters when the whole book missed its target, so
+    an empty selection would leave the book unchanged for another round.
+    """
+    weak = chapters_below(scores, threshold)
+    if weak or not scores:
+        return weak
+    lowest = sorted(range(len(scores)), key=lambda index: scores[index]["overall"])[:fallback]
+    return sorted(lowest)
+
+def replace_chapters(preamble: str, chapters: List[str], replacements: Dict[int, str]) -> str:
+    """Reassemble text from split_chapters output with some chapters replaced"""
+    return preamble + "".join(replacements.get(index, chapter) for index, chapter in enumerate(chapters))
\ No newline at end of file
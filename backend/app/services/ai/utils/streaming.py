@@ -0,0 +1,25 @@
+from typing import Optional
+from ..models.base import AIModel
+from ...event_service import event_service
+from ....models import BookStatus
+
+async def generate_streaming(
+    book_id: int,
+    model: AIModel,
+    prompt: str,
+    progress: str,
+    chapter: Optional[int] = None
+) -> str:
+    """Generate with the model's stream, publishing coalesced deltas as they arrive.
+
+    Chapters written in parallel pass their index so subscribers (and the
+    coalescer) keep each chapter's text separate.
+    """
+    chunks = []
+    event = {"status": BookStatus.GENERATING, "progress": progress}
+    if chapter is not None:
+        event["chapter"] = chapter
+    async for delta in model.generate_stream(prompt):
+        chunks.append(delta)
+        await event_service.publish(book_id, {**event, "delta": delta}, coalesce=True)
+    return "".join(chunks)
\ No newline at end of file
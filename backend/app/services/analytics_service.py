@@ -1,5 +1,6 @@
 import hashlib
 import json
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 from fastapi import BackgroundTasks
@@ -13,10 +14,16 @@ from app.models.analytics import (
 )
 from app.models.agent import AgentType
 from app.core.config import settings
+from app.services.cache_admission import CountMinSketch
+from app.services.supabase_executor import supabase_executor
 
 class AnalyticsService:
     def __init__(self):
         self._init_metrics_cache()
+        # Per-prompt request frequency and generation time, for cache admission
+        self.prompt_frequency = CountMinSketch()
+        self.prompt_generation_times: OrderedDict[str, float] = OrderedDict()
+        self.max_tracked_prompts = 10000
         self.use_supabase = False
         try:
             from supabase import create_client, Client
@@ -74,6 +81,7 @@ class AnalyticsService:
         
         # Update in-memory metrics
         self._update_metrics(agent_type, event)
+        self._update_prompt_stats(event)
 
         # Flush to Supabase if configured
         if self.use_supabase and (
@@ -121,6 +129,55 @@ class AnalyticsService:
         elif event.metric_type == MetricType.CACHE_SIZE:
             metrics.cache.storage_bytes = int(event.value)
 
+        elif event.metric_type == MetricType.LOCAL_CACHE_HIT:
+            metrics.cache.local_hits += 1
+
+        elif event.metric_type == MetricType.LOCAL_CACHE_MISS:
+            metrics.cache.local_misses += 1
+
+        elif event.metric_type == MetricType.CACHE_EVICTION:
+            metrics.cache.evictions += int(event.value)
+
+        elif event.metric_type == MetricType.COMPRESSION_RATIO:
+            metrics.cache.avg_compression_ratio = (
+                (metrics.cache.avg_compression_ratio * metrics.cache.compressed_entries + event.value) /
+                (metrics.cache.compressed_entries + 1)
+            )
+            metrics.cache.compressed_entries += 1
+
+        elif event.metric_type == MetricType.DECODE_TIME:
+            metrics.cache.avg_decode_ms = (
+                (metrics.cache.avg_decode_ms * metrics.cache.decodes + event.value) /
+                (metrics.cache.decodes + 1)
+            )
+            metrics.cache.decodes += 1
+
+    def _update_prompt_stats(self, event: AnalyticsEvent):
+        """Track per-prompt request frequency and generation time"""
+        if not event.prompt_hash:
+            return
+
+        if event.metric_type in (MetricType.CACHE_HIT, MetricType.CACHE_MISS):
+            self.prompt_frequency.increment(event.prompt_hash)
+
+        elif event.metric_type == MetricType.GENERATION_TIME and event.value > 0:
+            previous = self.prompt_generation_times.pop(event.prompt_hash, None)
+            self.prompt_generation_times[event.prompt_hash] = (
+                event.value if previous is None else 0.7 * previous + 0.3 * event.value
+            )
+            while len(self.prompt_generation_times) > self.max_tracked_prompts:
+                self.prompt_generation_times.popitem(last=False)
+
+    def estimate_request_frequency(self, prompt_hash: str) -> int:
+        """Approximate recent number of requests for a prompt"""
+        return self.prompt_frequency.estimate(prompt_hash)
+
+    def estimate_generation_time(self, agent_type: AgentType, prompt_hash: str) -> float:
+        """Seconds it took to generate a prompt, or the agent's average if unseen"""
+        if prompt_hash in self.prompt_generation_times:
+            return self.prompt_generation_times[prompt_hash]
+        return self.metrics_cache[agent_type]['metrics'].generation.avg_time_seconds
+
     async def _flush_metrics(self, agent_type: AgentType):
         """Flush cached metrics to Supabase if configured"""
         if not self.use_supabase:
@@ -132,15 +189,15 @@ class AnalyticsService:
 
         try:
             # Batch insert events
-            self.supabase.table('analytics_events').insert([
+            await supabase_executor.execute(self.supabase.table('analytics_events').insert([
                 event.dict() for event in events
-            ]).execute()
+            ]))
 
             # Update aggregated metrics
-            self.supabase.table('agent_metrics').upsert(
+            await supabase_executor.execute(self.supabase.table('agent_metrics').upsert(
                 self.metrics_cache[agent_type]['metrics'].dict(),
                 on_conflict='agent_type'
-            ).execute()
+            ))
 
             # Clear events cache but keep metrics
             self.metrics_cache[agent_type]['events'] = []
@@ -0,0 +1,159 @@
+import codecs
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Set, Union
+from app.core.config import settings
+
+ARTIFACT_KEY = "artifact"
+
+class ArtifactMissingError(Exception):
+    """Raised when a reference points at an artifact that is no longer on disk"""
+
+    def __init__(self, digest: str):
+        super().__init__(f"Artifact {digest} is missing from the store")
+        self.digest = digest
+
+class ArtifactStore:
+    """Content-addressed on-disk store for large generation outputs.
+
+    Artifacts are written once under their sha256 digest (sharded as
+    ab/cd/<digest>) via an atomic rename, so identical outputs are stored a
+    single time and concurrent writers never expose partial files. Reads
+    are memory-mapped. Database columns hold small references of the form
+    {"artifact": <digest>, "size": <bytes>} instead of the text itself.
+    """
+
+    def __init__(self, root: str, inline_max_bytes: int):
+        # A relative path would resolve against each process's working directory,
+        # so the API and workers could silently read and write different stores
+        if not os.path.isabs(root):
+            raise ValueError(f"Artifact store path must be absolute, got {root!r}")
+        self.root = root
+        self.inline_max_bytes = inline_max_bytes
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def put(self, data: bytes) -> str:
+        """Store bytes and return their digest; existing content is not rewritten"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    @contextmanager
+    def open(self, digest: str) -> Iterator[Union[mmap.mmap, bytes]]:
+        """Memory-map an artifact for reading without copying it into the heap"""
+        try:
+            f = open(self._path(digest), "rb")
+        except FileNotFoundError:
+            raise ArtifactMissingError(digest) from None
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def iter_text(self, digest: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """Decode an artifact chunk by chunk so only chunk_size bytes are copied at a time"""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with self.open(digest) as mapped:
+            for offset in range(0, len(mapped), chunk_size):
+                text = decoder.decode(mapped[offset:offset + chunk_size])
+                if text:
+                    yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def read_text(self, digest: str) -> str:
+        """Whole artifact as a str; prefer iter_text when the caller can stream"""
+        with self.open(digest) as mapped:
+            view = memoryview(mapped)
+            try:
+                return str(view, "utf-8")
+            finally:
+                # An exported buffer would keep the mapping from closing
+                view.release()
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def is_ref(self, value: Any) -> bool:
+        return isinstance(value, dict) and set(value) == {ARTIFACT_KEY, "size"}
+
+    def externalize(self, value: Any) -> Any:
+        """Replace large strings with artifact references; other values pass through"""
+        if not isinstance(value, str):
+            return value
+        data = value.encode()
+        if len(data) < self.inline_max_bytes:
+            return value
+        return {ARTIFACT_KEY: self.put(data), "size": len(data)}
+
+    def referenced_digests(self, value: Any) -> Set[str]:
+        """Digests of every artifact reference inside a stored JSON value"""
+        if self.is_ref(value):
+            return {value[ARTIFACT_KEY]}
+        if isinstance(value, dict):
+            items = value.values()
+        elif isinstance(value, list):
+            items = value
+        else:
+            return set()
+        return set().union(*(self.referenced_digests(item) for item in items))
+
+    def gc(self, live_digests: Iterable[str], grace_seconds: float) -> int:
+        """Delete artifacts (and abandoned temp files) no longer referenced anywhere.
+
+        Files younger than grace_seconds are kept: a writer stores its artifact
+        before committing the row that references it.
+        """
+        live = set(live_digests)
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name in live:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    if os.path.getmtime(path) > cutoff:
+                        continue
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+        return removed
+
+    def resolve(self, value: Any) -> Any:
+        """Inverse of externalize, applied recursively to dicts and lists"""
+        if self.is_ref(value):
+            return self.read_text(value[ARTIFACT_KEY])
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+artifact_store = ArtifactStore(settings.ARTIFACT_STORE_PATH, settings.ARTIFACT_INLINE_MAX_BYTES)
\ No newline at end of file
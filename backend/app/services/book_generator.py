@@ -1,14 +1,12 @@
-```python
 from typing import Dict, Any
-import openai
-import anthropic
+from .client_pool import client_pool
 from .event_service import event_service
 from ..models import BookStatus
 
 class BookGenerator:
     def __init__(self):
-        self.openai_client = openai.OpenAI()
-        self.anthropic_client = anthropic.Anthropic()
+        self.openai_client = client_pool.openai
+        self.anthropic_client = client_pool.anthropic
 
     async def generate_outline(self, book_data: Dict[str, Any]) -> str:
         await event_service.publish(book_data["id"], {
@@ -40,7 +38,8 @@ class BookGenerator:
             "progress": "Writing the book content..."
         })
         
-        response = await self.anthropic_client.messages.create(
+        chunks = []
+        async with self.anthropic_client.messages.stream(
             model="claude-3-opus-20240229",
             max_tokens=100000,
             messages=[{
@@ -51,8 +50,15 @@ class BookGenerator:
                 Tone: {book_data['tone']}
                 Target Audience: {book_data['target_audience']}"""
             }]
-        )
-        return response.content
+        ) as stream:
+            async for delta in stream.text_stream:
+                chunks.append(delta)
+                await event_service.publish(book_data["id"], {
+                    "status": BookStatus.GENERATING,
+                    "progress": "Writing the book content...",
+                    "delta": delta
+                }, coalesce=True)
+        return "".join(chunks)
 
     async def enhance_dialogues(self, content: str, book_id: int) -> str:
         await event_service.publish(book_id, {
@@ -86,5 +92,4 @@ class BookGenerator:
                 "content": f"Review and polish this book for consistency, flow, and impact: {content}"
             }]
         )
-        return response.content
-```
\ No newline at end of file
+        return response.content
\ No newline at end of file
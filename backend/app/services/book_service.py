@@ -1,9 +1,10 @@
-```python
 from typing import Dict, Any
 from sqlalchemy.orm import Session
 from ..models import Book, BookStatus
 from .book_generator import BookGenerator
 from .event_service import event_service
+from .checkpoint_service import checkpoint_service
+from .artifact_store import artifact_store
 
 class BookService:
     def __init__(self, db: Session):
@@ -27,31 +28,56 @@ class BookService:
             book.status = BookStatus.GENERATING
             self.db.commit()
 
+            book_data = book.__dict__
+
+            # Each stage resumes from its checkpoint if an earlier run completed it
+
             # Generate outline
-            outline = await self.generator.generate_outline(book.__dict__)
+            outline = await checkpoint_service.run_stage(
+                book_id, "outline",
+                lambda: self.generator.generate_outline(book_data)
+            )
 
             # Generate initial content
-            content = await self.generator.generate_content(outline, book.__dict__)
+            content = await checkpoint_service.run_stage(
+                book_id, "content",
+                lambda: self.generator.generate_content(outline, book_data)
+            )
 
             # Enhance dialogues
-            enhanced_content = await self.generator.enhance_dialogues(content, book_id)
+            enhanced_content = await checkpoint_service.run_stage(
+                book_id, "enhanced_content",
+                lambda: self.generator.enhance_dialogues(content, book_id)
+            )
 
             # Final review
-            final_content = await self.generator.final_review(enhanced_content, book_id)
+            final_content = await checkpoint_service.run_stage(
+                book_id, "final_content",
+                lambda: self.generator.final_review(enhanced_content, book_id)
+            )
 
             # Update book with final content
             book.content = {
-                "structure": outline,
-                "content": final_content
+                "structure": artifact_store.externalize(outline),
+                "content": artifact_store.externalize(final_content)
             }
             book.status = BookStatus.COMPLETED
-            
+            self.db.commit()
+
+            # Checkpoints are only dropped once the finished book is durable
+            try:
+                await checkpoint_service.clear(book_id)
+            except Exception as e:
+                print(f"Failed to clear checkpoints for book {book_id}: {str(e)}")
+
             await event_service.publish(book_id, {
                 "status": BookStatus.COMPLETED,
                 "progress": "Book generation completed!"
             })
 
         except Exception as e:
+            # Discard whatever a failed commit left pending before recording the failure
+            self.db.rollback()
             book.status = BookStatus.FAILED
             await event_service.publish(book_id, {
                 "status": BookStatus.FAILED,
@@ -68,6 +94,5 @@ class BookService:
         
         return {
             "status": book.status,
-            "content": book.content if book.status == BookStatus.COMPLETED else None
-        }
-```
\ No newline at end of file
+            "content": artifact_store.resolve(book.content) if book.status == BookStatus.COMPLETED else None
+        }
\ No newline at end of file
@@ -0,0 +1,125 @@
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+class CountMinSketch:
+    """TinyLFU frequency sketch: approximate counts that age by periodic halving"""
+
+    def __init__(self, width: int = 16384, depth: int = 4, sample_size: int = 100000):
+        self.width = width
+        self.depth = depth
+        self.sample_size = sample_size
+        self.additions = 0
+        self._rows: List[List[int]] = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(digest[row * 4:(row + 1) * 4], "big") % self.width
+            for row in range(self.depth)
+        ]
+
+    def increment(self, key: str) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        # Halving keeps recent popularity relevant without forgetting it outright
+        for row in self._rows:
+            for index, count in enumerate(row):
+                row[index] = count // 2
+        self.additions //= 2
+
+class CostAwareAdmission:
+    """Values cache entries by the generation seconds they are expected to save.
+
+    value = request frequency x measured regeneration time, both taken from
+    analytics_service. New entries are only admitted to the shared cache when
+    their value clears min_saved_seconds, and a full local tier only evicts
+    entries whose combined value is lower than the candidate's.
+    """
+
+    def __init__(self, analytics, min_saved_seconds: float):
+        self.analytics = analytics
+        self.min_saved_seconds = min_saved_seconds
+
+    def value(self, agent_type: str, prompt_hash: str) -> float:
+        return (
+            self.analytics.estimate_request_frequency(prompt_hash) *
+            self.analytics.estimate_generation_time(agent_type, prompt_hash)
+        )
+
+    def admit(self, agent_type: str, prompt_hash: str) -> bool:
+        return self.value(agent_type, prompt_hash) >= self.min_saved_seconds
+
+class LocalCacheTier:
+    """Bounded in-process LRU of cache entries, sized by output bytes"""
+
+    def __init__(self, max_bytes: int, admission: Optional[CostAwareAdmission] = None):
+        self.max_bytes = max_bytes
+        self.admission = admission
+        self.size_bytes = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float, datetime, int]] = OrderedDict()
+
+    def get(self, key: tuple[str, str]) -> Optional[tuple[str, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        output, score, expires_at, size = entry
+        if expires_at <= datetime.utcnow():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return output, score
+
+    def put(self, key: tuple[str, str], output: str, score: float, expires_at: datetime) -> int:
+        """Store an entry and return how many entries were evicted to make room"""
+        size = len(output.encode())
+        if size > self.max_bytes:
+            return 0
+
+        # A refreshed key only needs room for the growth over its current size
+        existing = self._entries.get(key)
+        used = self.size_bytes - (existing[3] if existing else 0)
+
+        # Least recently used entries that would have to go to fit the new one
+        victims = []
+        freed = 0
+        for victim in self._entries:
+            if used - freed + size <= self.max_bytes:
+                break
+            if victim == key:
+                continue
+            victims.append(victim)
+            freed += self._entries[victim][3]
+
+        # Only displace entries that together save fewer generation seconds;
+        # a rejected refresh leaves the existing entry untouched
+        if victims and self.admission and (
+            self.admission.value(*key) < sum(self.admission.value(*victim) for victim in victims)
+        ):
+            return 0
+
+        for victim in victims:
+            self._remove(victim)
+
+        self._entries[key] = (output, score, expires_at, size)
+        self._entries.move_to_end(key)
+        self.size_bytes = used - freed + size
+        return len(victims)
+
+    def remove_expired(self) -> None:
+        now = datetime.utcnow()
+        for key in [key for key, entry in self._entries.items() if entry[2] <= now]:
+            self._remove(key)
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        _, _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
\ No newline at end of file
@@ -1,8 +1,15 @@
-from datetime import datetime, timedelta
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from supabase import create_client, Client
 from app.core.config import settings
 from app.models.agent import AgentType
+from app.models.analytics import MetricType
+from app.services.analytics_service import analytics_service
+from app.services.payload_codec import payload_codec
+from app.services.cache_admission import CostAwareAdmission, LocalCacheTier
+from app.services.supabase_executor import supabase_executor
 
 class CacheService:
     def __init__(self):
@@ -10,28 +17,53 @@ class CacheService:
             settings.SUPABASE_URL,
             settings.SUPABASE_KEY
         )
+        self.admission = CostAwareAdmission(analytics_service, settings.CACHE_ADMISSION_MIN_SECONDS)
+        self.local = LocalCacheTier(settings.CACHE_LOCAL_MAX_BYTES, self.admission)
         self._ensure_table()
 
     def _ensure_table(self):
         # Create table if not exists using Supabase's SQL editor
         self.supabase.table('generation_cache').select('*').limit(1).execute()
 
+    def _hash_prompt(self, prompt: str) -> str:
+        """Cache key for a prompt; same sha256 as analytics_events.prompt_hash"""
+        return hashlib.sha256(prompt.encode()).hexdigest()
+
     async def get_cached_result(self, prompt: str, agent_type: AgentType) -> Optional[tuple[str, float]]:
         """Get cached result if available and valid"""
+        prompt_hash = self._hash_prompt(prompt)
+        local_key = (agent_type, prompt_hash)
+        local_result = self.local.get(local_key)
+        await analytics_service.track_event(
+            agent_type=agent_type,
+            metric_type=MetricType.LOCAL_CACHE_HIT if local_result else MetricType.LOCAL_CACHE_MISS,
+            value=1,
+            prompt=prompt
+        )
+        if local_result:
+            return local_result
+
         try:
-            result = self.supabase.table('generation_cache').select('*').eq(
-                'prompt', prompt
+            # Unique (prompt_hash, agent_type) index: at most one row, found by index
+            result = await supabase_executor.execute(self.supabase.table('generation_cache').select(
+                'output, output_encoding, score, expires_at'
+            ).eq(
+                'prompt_hash', prompt_hash
             ).eq(
                 'agent_type', agent_type
             ).gte(
                 'expires_at', datetime.utcnow().isoformat()
             ).gte(
                 'score', 9.5
-            ).order('created_at', desc=True).limit(1).execute()
+            ).limit(1))
 
             if result.data:
                 entry = result.data[0]
-                return entry['output'], entry['score']
+                output = await self._decode_output(agent_type, entry)
+                await self._store_local(
+                    local_key, output, entry['score'], self._parse_timestamp(entry['expires_at'])
+                )
+                return output, entry['score']
             return None
         except Exception as e:
             print(f"Cache read error: {e}")
@@ -42,25 +74,76 @@ class CacheService:
         if score < 9.5:
             return
 
+        # Skip entries that are cheap to regenerate or rarely requested
+        prompt_hash = self._hash_prompt(prompt)
+        if not self.admission.admit(agent_type, prompt_hash):
+            return
+
         try:
             now = datetime.utcnow()
-            self.supabase.table('generation_cache').insert({
+            expires_at = now + timedelta(hours=settings.CACHE_TTL_HOURS)
+            output_encoding, payload = payload_codec.encode(output)
+            await supabase_executor.execute(self.supabase.table('generation_cache').upsert({
+                'prompt_hash': prompt_hash,
                 'prompt': prompt,
                 'agent_type': agent_type,
-                'output': output,
+                'output': payload,
+                'output_encoding': output_encoding,
                 'score': score,
                 'created_at': now.isoformat(),
-                'expires_at': (now + timedelta(hours=24)).isoformat()
-            }).execute()
+                'expires_at': expires_at.isoformat()
+            }, on_conflict='prompt_hash,agent_type'))
+            await self._store_local((agent_type, prompt_hash), output, score, expires_at)
+
+            if output_encoding != 'identity':
+                await analytics_service.track_event(
+                    agent_type=agent_type,
+                    metric_type=MetricType.COMPRESSION_RATIO,
+                    value=len(output.encode()) / len(payload),
+                    prompt=prompt,
+                    additional_data={'encoding': output_encoding}
+                )
         except Exception as e:
             print(f"Cache write error: {e}")
 
+    async def _decode_output(self, agent_type: AgentType, entry: dict) -> str:
+        """Decompress a stored output, reporting decode time in milliseconds"""
+        encoding = entry.get('output_encoding')
+        start = time.perf_counter()
+        output = payload_codec.decode(encoding, entry['output'])
+        if encoding and encoding != 'identity':
+            await analytics_service.track_event(
+                agent_type=agent_type,
+                metric_type=MetricType.DECODE_TIME,
+                value=(time.perf_counter() - start) * 1000,
+                additional_data={'encoding': encoding}
+            )
+        return output
+
+    async def _store_local(self, key: tuple[str, str], output: str, score: float, expires_at: datetime):
+        evicted = self.local.put(key, output, score, expires_at)
+        if evicted:
+            await analytics_service.track_event(
+                agent_type=key[0],
+                metric_type=MetricType.CACHE_EVICTION,
+                value=evicted,
+                additional_data={'tier': 'local', 'size_bytes': self.local.size_bytes}
+            )
+
+    def _parse_timestamp(self, value: str) -> datetime:
+        """Parse a Supabase timestamp into naive UTC, matching datetime.utcnow()"""
+        timestamp = datetime.fromisoformat(value)
+        if timestamp.tzinfo:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
+
     async def cleanup_expired(self):
         """Remove expired cache entries"""
+        self.local.remove_expired()
         try:
-            self.supabase.table('generation_cache').delete().lt(
+            await supabase_executor.execute(self.supabase.table('generation_cache').delete().lt(
                 'expires_at', datetime.utcnow().isoformat()
-            ).execute()
+            ))
         except Exception as e:
             print(f"Cache cleanup error: {e}")
 
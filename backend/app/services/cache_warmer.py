@@ -0,0 +1,67 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.supabase_executor import supabase_executor
+
+class CacheWarmer:
+    """Extends frequently requested cache entries before their TTL runs out.
+
+    Request frequency comes from the cache_hit/cache_miss rows in
+    analytics_events, keyed by the same prompt_hash as generation_cache.
+    Extension only runs off-peak, so entries written at peak do not all
+    expire together at the next peak. Entries past CACHE_WARMUP_MAX_AGE_HOURS
+    are left to expire and be regenerated on the next request.
+    """
+
+    def __init__(self):
+        self.supabase = cache_service.supabase
+
+    def is_off_peak(self, now: Optional[datetime] = None) -> bool:
+        hour = (now or datetime.utcnow()).hour
+        start = settings.CACHE_WARMUP_OFF_PEAK_START_HOUR
+        end = settings.CACHE_WARMUP_OFF_PEAK_END_HOUR
+        if start <= end:
+            return start <= hour < end
+        # Window wraps midnight, e.g. 22 -> 4
+        return hour >= start or hour < end
+
+    async def candidates(self) -> List[dict]:
+        result = await supabase_executor.execute(self.supabase.rpc('cache_warmup_candidates', {
+            'lookback_hours': settings.CACHE_WARMUP_LOOKBACK_HOURS,
+            'expiring_within_hours': settings.CACHE_WARMUP_EXPIRING_WITHIN_HOURS,
+            'min_requests': settings.CACHE_WARMUP_MIN_REQUESTS,
+            'max_age_hours': settings.CACHE_WARMUP_MAX_AGE_HOURS,
+            'max_rows': settings.CACHE_WARMUP_MAX_ENTRIES
+        }))
+        return result.data or []
+
+    async def warm(self, force: bool = False) -> Dict[str, int]:
+        """Push back expires_at on hot entries; returns counts of what was done"""
+        if not force and not self.is_off_peak():
+            return {'candidates': 0, 'extended': 0}
+
+        candidates = await self.candidates()
+        by_agent: Dict[str, List[str]] = defaultdict(list)
+        for candidate in candidates:
+            by_agent[candidate['agent_type']].append(candidate['prompt_hash'])
+
+        expires_at = (datetime.utcnow() + timedelta(hours=settings.CACHE_TTL_HOURS)).isoformat()
+        extended = 0
+        for agent_type, prompt_hashes in by_agent.items():
+            try:
+                await supabase_executor.execute(self.supabase.table('generation_cache').update({
+                    'expires_at': expires_at
+                }).eq(
+                    'agent_type', agent_type
+                ).in_(
+                    'prompt_hash', prompt_hashes
+                ))
+                extended += len(prompt_hashes)
+            except Exception as e:
+                print(f"Cache warm-up error for {agent_type}: {e}")
+
+        return {'candidates': len(candidates), 'extended': extended}
+
+cache_warmer = CacheWarmer()
\ No newline at end of file
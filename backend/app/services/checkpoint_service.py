@@ -0,0 +1,74 @@
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from ..database import SessionLocal
+from ..models import GenerationCheckpoint
+from .artifact_store import ArtifactMissingError, artifact_store
+
+T = TypeVar('T')
+
+class CheckpointService:
+    """Persists completed stage outputs so a failed generation can resume"""
+
+    async def load(self, book_id: int, stage: str) -> Optional[Any]:
+        db = SessionLocal()
+        try:
+            checkpoint = db.query(GenerationCheckpoint).filter(
+                GenerationCheckpoint.book_id == book_id,
+                GenerationCheckpoint.stage == stage
+            ).first()
+            if not checkpoint:
+                return None
+            try:
+                return artifact_store.resolve(checkpoint.output)
+            except ArtifactMissingError as e:
+                # Treat a lost artifact like a missing checkpoint and rerun the stage
+                print(f"Ignoring '{stage}' checkpoint for book {book_id}: {str(e)}")
+                return None
+        finally:
+            db.close()
+
+    async def save(self, book_id: int, stage: str, output: Any) -> None:
+        # Large outputs are kept in the artifact store; the row only holds a reference
+        output = artifact_store.externalize(output)
+        db = SessionLocal()
+        try:
+            checkpoint = db.query(GenerationCheckpoint).filter(
+                GenerationCheckpoint.book_id == book_id,
+                GenerationCheckpoint.stage == stage
+            ).first()
+            if checkpoint:
+                checkpoint.output = output
+            else:
+                db.add(GenerationCheckpoint(book_id=book_id, stage=stage, output=output))
+            db.commit()
+        finally:
+            db.close()
+
+    async def clear(self, book_id: int) -> None:
+        """Drop all checkpoints for a book once its generation has completed"""
+        db = SessionLocal()
+        try:
+            db.query(GenerationCheckpoint).filter(
+                GenerationCheckpoint.book_id == book_id
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    async def run_stage(
+        self,
+        book_id: int,
+        stage: str,
+        operation: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Return the checkpointed output for a stage, or run it and checkpoint the result"""
+        output = await self.load(book_id, stage)
+        if output is not None:
+            print(f"Resuming book {book_id} from '{stage}' checkpoint")
+            return output
+
+        output = await operation()
+        if output is not None:
+            await self.save(book_id, stage, output)
+        return output
+
+checkpoint_service = CheckpointService()
\ No newline at end of file
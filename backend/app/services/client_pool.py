@@ -0,0 +1,112 @@
+from typing import AsyncIterator, Optional
+import httpx
+from openai import AsyncOpenAI
+from anthropic import AsyncAnthropic
+from app.core.config import settings
+from app.services.retry_service import retry_service, AdaptiveRateLimiter
+
+class _SlotReleasingStream(httpx.AsyncByteStream):
+    """Response body that gives the limiter slot back once the body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, limiter: AdaptiveRateLimiter):
+        self.stream = stream
+        self.limiter = limiter
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                await self.limiter.release()
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Routes every request of a provider client through its adaptive rate limiter"""
+
+    def __init__(self, limiter: AdaptiveRateLimiter, transport: httpx.AsyncBaseTransport):
+        self.limiter = limiter
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # The slot is held until the body is closed, so streamed generations count
+        # against the concurrency limit for their whole duration, not just the headers
+        await self.limiter.acquire()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            await self.limiter.release()
+            raise
+        if response.is_closed:
+            # Body already loaded in memory (e.g. mocked responses); nothing left to stream
+            await self.limiter.release()
+        else:
+            response.stream = _SlotReleasingStream(response.stream, self.limiter)
+
+        # 529 is Anthropic's "overloaded", which behaves like a rate limit
+        if response.status_code in (429, 529):
+            retry_after = response.headers.get("retry-after")
+            self.limiter.record_rate_limited(
+                float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+        elif response.status_code < 500:
+            self.limiter.record_success()
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+class ClientPool:
+    """Process-wide async LLM clients sharing keep-alive HTTP connection pools"""
+
+    def __init__(self):
+        self._openai: Optional[AsyncOpenAI] = None
+        self._anthropic: Optional[AsyncAnthropic] = None
+        self._http_clients: list[httpx.AsyncClient] = []
+
+    def _build_http_client(self, provider: str) -> httpx.AsyncClient:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+            )
+        )
+        http_client = httpx.AsyncClient(
+            transport=RateLimitedTransport(retry_service.limiter(provider), transport),
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=10.0)
+        )
+        self._http_clients.append(http_client)
+        return http_client
+
+    @property
+    def openai(self) -> AsyncOpenAI:
+        if self._openai is None:
+            self._openai = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                http_client=self._build_http_client("openai")
+            )
+        return self._openai
+
+    @property
+    def anthropic(self) -> AsyncAnthropic:
+        if self._anthropic is None:
+            self._anthropic = AsyncAnthropic(
+                api_key=settings.CLAUDE_API_KEY,
+                http_client=self._build_http_client("anthropic")
+            )
+        return self._anthropic
+
+    async def close(self):
+        """Close pooled connections on shutdown"""
+        for http_client in self._http_clients:
+            await http_client.aclose()
+        self._http_clients = []
+        self._openai = None
+        self._anthropic = None
+
+client_pool = ClientPool()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+
+class CoalescingService:
+    """Single-flight coalescing of identical in-flight generations.
+
+    Concurrent callers with the same (agent type, prompt hash) await one
+    shared generation instead of each calling the model. Agent types are
+    AgentType values; any string key works.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Side effects of finished generations, owned here rather than by any caller
+        self._side_effects: Set[asyncio.Task] = set()
+
+    async def run(
+        self,
+        agent_type: str,
+        prompt: str,
+        operation: Callable[[], Awaitable[T]],
+        on_result: Optional[Callable[[T], Awaitable[None]]] = None
+    ) -> T:
+        """Return the shared result of operation for this (agent type, prompt).
+
+        on_result (from the caller that started the generation) runs once per
+        successful generation, such as caching it and recording metrics. It
+        runs in a task owned by the coalescer, so it still happens if that
+        caller is cancelled.
+        """
+        key = (agent_type, hashlib.sha256(prompt.encode()).hexdigest())
+        shared = self._in_flight.get(key)
+        if shared is None:
+            shared = asyncio.ensure_future(operation())
+            self._in_flight[key] = shared
+            shared.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            if on_result is not None:
+                shared.add_done_callback(lambda done: self._after(done, on_result))
+
+        # Shielded so one caller going away does not cancel the others' result
+        return await asyncio.shield(shared)
+
+    def _after(self, done: asyncio.Future, on_result: Callable[[Any], Awaitable[None]]):
+        if done.cancelled() or done.exception() is not None:
+            return
+        task = asyncio.ensure_future(self._record(on_result, done.result()))
+        self._side_effects.add(task)
+        task.add_done_callback(self._side_effects.discard)
+
+    async def _record(self, on_result: Callable[[Any], Awaitable[None]], result: Any):
+        try:
+            await on_result(result)
+        except Exception as e:
+            print(f"Error recording coalesced generation: {e}")
+
+    async def drain(self):
+        """Wait for pending side effects, e.g. before shutdown"""
+        while self._side_effects:
+            await asyncio.gather(*self._side_effects, return_exceptions=True)
+
+    def in_flight_count(self) -> int:
+        return len(self._in_flight)
+
+coalescing_service = CoalescingService()
\ No newline at end of file
@@ -0,0 +1,161 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import json
+import re
+import time
+import uuid
+import asyncpg
+from ..core.config import settings
+
+Deliver = Callable[[int, int, str], Awaitable[None]]
+
+class EventBroker(ABC):
+    """Carries serialized events to the EventService of every process"""
+
+    def __init__(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, book_id: int, event_id: int, payload: str):
+        pass
+
+class InProcessBroker(EventBroker):
+    """Single-process delivery; subscribers only see events published in the same process"""
+
+    async def publish(self, book_id: int, event_id: int, payload: str):
+        await self._deliver(book_id, event_id, payload)
+
+class PostgresBroker(EventBroker):
+    """Fan-out across API and worker processes through Postgres LISTEN/NOTIFY.
+
+    NOTIFY payloads are limited to 8000 bytes, so larger events are split
+    into parts that listeners reassemble before delivery. Parts of a message
+    that never completes (a publisher died mid-send) are dropped after
+    PARTS_TTL_SECONDS, and at most MAX_PENDING_MESSAGES are held at once.
+    """
+
+    MAX_PAYLOAD_BYTES = 7000
+    PARTS_TTL_SECONDS = 30.0
+    MAX_PENDING_MESSAGES = 1000
+
+    def __init__(self, deliver: Deliver, dsn: str, channel: str):
+        super().__init__(deliver)
+        self.dsn = dsn
+        self.channel = channel
+        self._pool: Optional[asyncpg.Pool] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._dispatcher: Optional[asyncio.Task] = None
+        # message id -> (first part arrival time, parts), oldest first
+        self._parts: OrderedDict[str, Tuple[float, List[Optional[str]]]] = OrderedDict()
+
+    async def start(self):
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=4)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        for task in (self._listener, self._dispatcher):
+            if task:
+                task.cancel()
+        await asyncio.gather(
+            *(task for task in (self._listener, self._dispatcher) if task),
+            return_exceptions=True
+        )
+        if self._pool:
+            await self._pool.close()
+
+    async def publish(self, book_id: int, event_id: int, payload: str):
+        if self._pool is None:
+            raise RuntimeError("PostgresBroker.publish called before start()")
+        for message in self._split(book_id, event_id, payload):
+            await self._pool.execute("SELECT pg_notify($1, $2)", self.channel, message)
+
+    def _split(self, book_id: int, event_id: int, payload: str) -> List[str]:
+        message = json.dumps({"book_id": book_id, "event_id": event_id, "payload": payload})
+        if len(message.encode()) <= self.MAX_PAYLOAD_BYTES:
+            return [message]
+
+        # Chunk by characters small enough that any UTF-8 / JSON escaping stays under the limit
+        size = self.MAX_PAYLOAD_BYTES // 8
+        chunks = [payload[i:i + size] for i in range(0, len(payload), size)]
+        message_id = uuid.uuid4().hex
+        return [
+            json.dumps({
+                "book_id": book_id, "event_id": event_id, "id": message_id,
+                "part": index, "parts": len(chunks), "payload": chunk
+            })
+            for index, chunk in enumerate(chunks)
+        ]
+
+    async def _listen(self):
+        """Hold a LISTEN connection open, reconnecting if it drops"""
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(self.channel, self._on_notify)
+                while not connection.is_closed():
+                    await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Event broker connection error: {e}")
+            finally:
+                if connection and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(1)
+
+    def _on_notify(self, connection, pid, channel, message: str):
+        # Listener callbacks are synchronous; a single dispatcher keeps delivery in order
+        self._inbox.put_nowait(message)
+
+    async def _dispatch(self):
+        while True:
+            message = json.loads(await self._inbox.get())
+            payload = self._reassemble(message)
+            if payload is None:
+                continue
+            try:
+                await self._deliver(message["book_id"], message["event_id"], payload)
+            except Exception as e:
+                print(f"Event delivery error: {e}")
+
+    def _reassemble(self, message: dict) -> Optional[str]:
+        if "id" not in message:
+            return message["payload"]
+        self._expire_parts()
+        if message["id"] not in self._parts:
+            self._parts[message["id"]] = (time.monotonic(), [None] * message["parts"])
+        _, parts = self._parts[message["id"]]
+        parts[message["part"]] = message["payload"]
+        if any(part is None for part in parts):
+            return None
+        del self._parts[message["id"]]
+        return "".join(parts)
+
+    def _expire_parts(self):
+        cutoff = time.monotonic() - self.PARTS_TTL_SECONDS
+        while self._parts:
+            message_id, (received_at, _) = next(iter(self._parts.items()))
+            if received_at > cutoff and len(self._parts) < self.MAX_PENDING_MESSAGES:
+                break
+            print(f"Dropping incomplete event message {message_id}")
+            del self._parts[message_id]
+
+def create_broker(deliver: Deliver) -> EventBroker:
+    if settings.EVENT_BROKER == "postgres":
+        # asyncpg takes a plain postgresql:// DSN, without SQLAlchemy's +driver suffix
+        dsn = re.sub(r"^postgres(ql)?\+\w+://", "postgresql://", settings.EVENT_BROKER_URL or settings.DATABASE_URL)
+        return PostgresBroker(deliver, dsn, settings.EVENT_BROKER_CHANNEL)
+    if settings.EVENT_BROKER != "memory":
+        raise ValueError(f"Unknown event broker {settings.EVENT_BROKER}")
+    return InProcessBroker(deliver)
\ No newline at end of file
@@ -1,28 +1,285 @@
-from typing import Dict, Set
-from fastapi import Request
-from asyncio import Queue
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import Enum
+import asyncio
 import json
+import time
+from ..core.config import settings
+from ..models import BookStatus
+from .event_broker import EventBroker, create_broker
+
+TERMINAL_STATUSES = {BookStatus.COMPLETED, BookStatus.FAILED}
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE_PROGRESS = "coalesce_progress"
+    DISCONNECT = "disconnect"
+
+def is_progress(event: Dict[str, Any]) -> bool:
+    """Anything but a completed/failed status update, which overflow handling tries to keep"""
+    return event.get("status") not in TERMINAL_STATUSES
+
+def can_merge(previous: Dict[str, Any], event: Dict[str, Any]) -> bool:
+    """Progress events merge unless they stream different chapters written in parallel"""
+    return is_progress(previous) and is_progress(event) and previous.get("chapter") == event.get("chapter")
+
+def merge_events(previous: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold a newer event into an older one, keeping streamed text intact"""
+    merged = {**previous, **event}
+    if "delta" in previous or "delta" in event:
+        merged["delta"] = previous.get("delta", "") + event.get("delta", "")
+    return merged
+
+class Subscription:
+    """Bounded queue of serialized events for one SSE client"""
+
+    def __init__(self, book_id: int, maxsize: int, policy: OverflowPolicy):
+        self.book_id = book_id
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: Deque[Tuple[int, Dict[str, Any], str]] = deque()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def offer(self, event_id: int, event: Dict[str, Any], payload: str) -> bool:
+        """Enqueue without blocking; returns False if the subscriber must be disconnected"""
+        if self.closed:
+            return False
+
+        if len(self._items) >= self.maxsize:
+            if self.policy == OverflowPolicy.DISCONNECT:
+                self.close()
+                return False
+            if self.policy == OverflowPolicy.COALESCE_PROGRESS and can_merge(self._items[-1][1], event):
+                # Merging with the newest queued event keeps ordering intact
+                _, previous, _ = self._items.pop()
+                event = merge_events(previous, event)
+                payload = json.dumps(event)
+                self.coalesced += 1
+            else:
+                self._drop_one()
+
+        self._items.append((event_id, event, payload))
+        self._ready.set()
+        return True
+
+    def _drop_one(self):
+        if self.policy == OverflowPolicy.COALESCE_PROGRESS:
+            # Prefer merging the oldest adjacent pair of progress events, then dropping one
+            for index in range(len(self._items) - 1):
+                _, first, _ = self._items[index]
+                second_id, second, _ = self._items[index + 1]
+                if can_merge(first, second):
+                    # The merged event carries the later id so resumes skip both
+                    merged = merge_events(first, second)
+                    del self._items[index + 1]
+                    self._items[index] = (second_id, merged, json.dumps(merged))
+                    self.coalesced += 1
+                    return
+            for index, (_, queued, _) in enumerate(self._items):
+                if is_progress(queued):
+                    del self._items[index]
+                    self.dropped += 1
+                    return
+        self._items.popleft()
+        self.dropped += 1
+
+    async def get(self) -> Optional[Tuple[int, str]]:
+        """Next (event id, serialized event), or None once the subscription is closed"""
+        while not self._items:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        if self.closed:
+            return None
+        event_id, _, payload = self._items.popleft()
+        return event_id, payload
+
+    def close(self):
+        self.closed = True
+        self._items.clear()
+        self._ready.set()
 
 class EventService:
-    def __init__(self):
-        self._queues: Dict[int, Set[Queue]] = {}
+    def __init__(
+        self,
+        max_queue_size: int = settings.EVENT_QUEUE_MAX_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy(settings.EVENT_OVERFLOW_POLICY)
+    ):
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self._queues: Dict[int, Set[Subscription]] = {}
+        self._published = 0
+        self._delivered = 0
+        self._disconnected = 0
+        # Counters of subscriptions that have already gone away
+        self._retired_dropped = 0
+        self._retired_coalesced = 0
+        # Recent events per book for Last-Event-ID replay, least recently used book first
+        self._history: OrderedDict[int, Deque[Tuple[int, str]]] = OrderedDict()
+        self._last_event_id = 0
+        # Progress events waiting out their coalescing window, per book
+        # book -> chapter (None outside parallel chapter writing) -> merged event, in arrival order
+        self._pending: Dict[int, Dict[Any, Dict[str, Any]]] = {}
+        self._flush_tasks: Dict[int, asyncio.Task] = {}
+        self._coalesced_publishes = 0
+        # Per-book [lock, users]: a flushed event and the publish after it reach the broker in order
+        self._publish_locks: Dict[int, List[Any]] = {}
+        self.broker: EventBroker = create_broker(self._deliver)
+
+    async def start(self):
+        await self.broker.start()
 
-    async def subscribe(self, book_id: int) -> Queue:
+    async def stop(self):
+        for book_id in list(self._pending):
+            await self.flush(book_id)
+        await self.broker.stop()
+
+    async def subscribe(self, book_id: int, last_event_id: Optional[int] = None) -> Subscription:
+        """Subscribe to a book, first replaying buffered events newer than last_event_id"""
         if book_id not in self._queues:
             self._queues[book_id] = set()
-        queue = Queue()
-        self._queues[book_id].add(queue)
-        return queue
-
-    async def unsubscribe(self, book_id: int, queue: Queue):
-        if book_id in self._queues:
-            self._queues[book_id].remove(queue)
-            if not self._queues[book_id]:
+        subscription = Subscription(book_id, self.max_queue_size, self.overflow_policy)
+        if last_event_id is not None:
+            missed = self.replay(book_id, last_event_id)
+            # Replaying more than the queue holds would trip the overflow policy before
+            # the client reads anything (and disconnect it in a loop), so resume from
+            # the newest events that fit
+            replayed = missed[-self.max_queue_size:]
+            subscription.dropped += len(missed) - len(replayed)
+            for event_id, payload in replayed:
+                subscription.offer(event_id, json.loads(payload), payload)
+        # No await between replay and registration, so nothing is missed or repeated
+        self._queues[book_id].add(subscription)
+        return subscription
+
+    def replay(self, book_id: int, last_event_id: int) -> List[Tuple[int, str]]:
+        history = self._history.get(book_id, ())
+        return [(event_id, payload) for event_id, payload in history if event_id > last_event_id]
+
+    def _next_event_id(self) -> int:
+        # Nanosecond clock ids order events across processes; the max() keeps them strictly increasing here
+        self._last_event_id = max(time.time_ns(), self._last_event_id + 1)
+        return self._last_event_id
+
+    def _remember(self, book_id: int, event_id: int, payload: str):
+        history = self._history.get(book_id)
+        if history is None:
+            history = self._history[book_id] = deque(maxlen=settings.EVENT_REPLAY_BUFFER_SIZE)
+            while len(self._history) > settings.EVENT_REPLAY_MAX_BOOKS:
+                self._history.popitem(last=False)
+        else:
+            self._history.move_to_end(book_id)
+        history.append((event_id, payload))
+
+    async def unsubscribe(self, book_id: int, subscription: Subscription):
+        subscribers = self._queues.get(book_id)
+        if subscribers and subscription in subscribers:
+            subscribers.remove(subscription)
+            self._retired_dropped += subscription.dropped
+            self._retired_coalesced += subscription.coalesced
+            if not subscribers:
                 del self._queues[book_id]
+        subscription.close()
+
+    async def publish(self, book_id: int, data: dict, coalesce: bool = False):
+        """Publish an event to every subscriber of a book.
+
+        With coalesce=True, progress events are merged per book (and per "chapter"
+        when chapters stream in parallel) and sent at most once per
+        EVENT_COALESCE_WINDOW_MS, or sooner once the merged delta reaches
+        EVENT_COALESCE_MAX_BYTES. Any other publish for the book flushes the
+        pending events first, so ordering is preserved.
+        """
+        if coalesce and is_progress(data):
+            # Chapters streamed in parallel are merged separately so their text never mixes
+            pending_by_chapter = self._pending.setdefault(book_id, {})
+            chapter = data.get("chapter")
+            pending = pending_by_chapter.get(chapter)
+            pending = merge_events(pending, data) if pending else dict(data)
+            pending_by_chapter[chapter] = pending
+            self._coalesced_publishes += 1
+            if len(pending.get("delta", "").encode()) >= settings.EVENT_COALESCE_MAX_BYTES:
+                await self.flush(book_id)
+            elif book_id not in self._flush_tasks:
+                self._flush_tasks[book_id] = asyncio.create_task(self._flush_later(book_id))
+            return
+
+        async with self._publish_lock(book_id):
+            await self._flush_locked(book_id)
+            await self._publish_now(book_id, data)
+
+    async def flush(self, book_id: int):
+        """Send the pending coalesced events for a book, if any"""
+        async with self._publish_lock(book_id):
+            await self._flush_locked(book_id)
+
+    async def _flush_locked(self, book_id: int):
+        task = self._flush_tasks.pop(book_id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+        for pending in self._pending.pop(book_id, {}).values():
+            await self._publish_now(book_id, pending)
+
+    @asynccontextmanager
+    async def _publish_lock(self, book_id: int):
+        """Held from popping a book's pending event until it and any follow-up are published"""
+        entry = self._publish_locks.setdefault(book_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._publish_locks[book_id]
+
+    async def _flush_later(self, book_id: int):
+        await asyncio.sleep(settings.EVENT_COALESCE_WINDOW_MS / 1000)
+        await self.flush(book_id)
+
+    async def _publish_now(self, book_id: int, data: Dict[str, Any]):
+        # Serialized once; the broker hands the same payload to every process
+        self._published += 1
+        await self.broker.publish(book_id, self._next_event_id(), json.dumps(data))
+
+    async def _deliver(self, book_id: int, event_id: int, payload: str):
+        """Record a brokered event for replay and fan it out to this process's subscribers"""
+        self._remember(book_id, event_id, payload)
+        if book_id not in self._queues:
+            return
+        data = json.loads(payload)
+        self._delivered += 1
+        for subscription in list(self._queues[book_id]):
+            if not subscription.offer(event_id, data, payload):
+                self._disconnected += 1
+                await self.unsubscribe(book_id, subscription)
 
-    async def publish(self, book_id: int, data: dict):
-        if book_id in self._queues:
-            for queue in self._queues[book_id]:
-                await queue.put(json.dumps(data))
+    def metrics(self) -> Dict[str, Any]:
+        subscriptions = [s for subscribers in self._queues.values() for s in subscribers]
+        depths = [len(s) for s in subscriptions]
+        return {
+            "books": len(self._queues),
+            "subscribers": len(subscriptions),
+            "broker": type(self.broker).__name__,
+            "published": self._published,
+            "coalesced_publishes": self._coalesced_publishes,
+            "delivered": self._delivered,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_max_size": self.max_queue_size,
+            "overflow_policy": self.overflow_policy.value,
+            "dropped": self._retired_dropped + sum(s.dropped for s in subscriptions),
+            "coalesced": self._retired_coalesced + sum(s.coalesced for s in subscriptions),
+            "disconnected": self._disconnected,
+            "replay_books": len(self._history)
+        }
 
 event_service = EventService()
\ No newline at end of file
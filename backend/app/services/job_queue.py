@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models import Book, GenerationJob, JobStatus
+
+class JobQueue:
+    """Durable generation job queue stored in the application database"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def enqueue(self, book_id: int) -> GenerationJob:
+        book = self.db.query(Book).filter(Book.id == book_id).first()
+        if not book:
+            raise ValueError("Book not found")
+
+        # Repeated generate requests for the same book share the pending job
+        active_job = self._active_job(book_id)
+        if active_job:
+            return active_job
+
+        job = GenerationJob(
+            book_id=book_id,
+            status=JobStatus.QUEUED,
+            attempts=0,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            visible_at=datetime.utcnow()
+        )
+        self.db.add(job)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # A concurrent request created the active job first
+            self.db.rollback()
+            return self._active_job(book_id)
+        self.db.refresh(job)
+        return job
+
+    def _active_job(self, book_id: int) -> Optional[GenerationJob]:
+        return self.db.query(GenerationJob).filter(
+            GenerationJob.book_id == book_id,
+            GenerationJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+        ).first()
+
+    async def claim(self, worker_id: str) -> Optional[GenerationJob]:
+        """Lease the oldest visible job, including running jobs whose lease expired"""
+        while True:
+            now = datetime.utcnow()
+            job = self.db.query(GenerationJob).filter(
+                GenerationJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+                GenerationJob.visible_at <= now
+            ).order_by(GenerationJob.id).with_for_update(skip_locked=True).first()
+
+            if not job:
+                self.db.commit()
+                return None
+
+            if job.attempts >= job.max_attempts:
+                job.status = JobStatus.FAILED
+                job.error = job.error or "Visibility timeout expired too many times"
+                self.db.commit()
+                continue
+
+            job.status = JobStatus.RUNNING
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.visible_at = now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT)
+            self.db.commit()
+            self.db.refresh(job)
+            return job
+
+    async def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Extend the lease on a running job; False if another worker took it over"""
+        updated = self.db.query(GenerationJob).filter(
+            GenerationJob.id == job_id,
+            GenerationJob.worker_id == worker_id,
+            GenerationJob.status == JobStatus.RUNNING
+        ).update({
+            GenerationJob.visible_at: datetime.utcnow() + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT)
+        }, synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
+
+    def _owned(self, job_id: int, worker_id: str):
+        # Only the worker holding the lease may finish a job; a stale worker matches nothing
+        return self.db.query(GenerationJob).filter(
+            GenerationJob.id == job_id,
+            GenerationJob.worker_id == worker_id,
+            GenerationJob.status == JobStatus.RUNNING
+        )
+
+    async def complete(self, job_id: int, worker_id: str) -> bool:
+        """Mark a job completed; False if the worker no longer owns it"""
+        updated = self._owned(job_id, worker_id).update({
+            GenerationJob.status: JobStatus.COMPLETED,
+            GenerationJob.error: None
+        }, synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Requeue a failed job until it runs out of attempts; False if the worker no longer owns it"""
+        updated = self._owned(job_id, worker_id).update({
+            GenerationJob.error: error,
+            GenerationJob.status: case(
+                (GenerationJob.attempts < GenerationJob.max_attempts, JobStatus.QUEUED.name),
+                else_=JobStatus.FAILED.name
+            ),
+            GenerationJob.visible_at: datetime.utcnow()
+        }, synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
+
+    def get_job(self, job_id: int) -> Optional[GenerationJob]:
+        return self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
\ No newline at end of file
@@ -1,11 +1,9 @@
-from openai import AsyncOpenAI
-from anthropic import AsyncAnthropic
-from app.core.config import settings
+from app.services.client_pool import client_pool
 
 class OpenAIService:
     def __init__(self):
-        self.openai = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.anthropic = AsyncAnthropic(api_key=settings.CLAUDE_API_KEY)
+        self.openai = client_pool.openai
+        self.anthropic = client_pool.anthropic
 
     async def generate_outline(self, prompt: str) -> str:
         response = await self.openai.chat.completions.create(
@@ -0,0 +1,88 @@
+import base64
+import hashlib
+import zlib
+from typing import Optional, Tuple
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+IDENTITY = "identity"
+
+class PayloadCodec:
+    """Compresses cached text payloads, preferring zstd and falling back to zlib.
+
+    Encoded payloads are base64 text tagged with their encoding, e.g.
+    "zstd", "zlib" or "zstd+dict:<id>" when a trained dictionary is used.
+    Untagged rows written before compression decode as identity.
+    """
+
+    def __init__(self, dictionary: Optional[bytes] = None, min_bytes: int = 1024, level: int = 9):
+        self.min_bytes = min_bytes
+        self.level = level
+        self.dictionary = dictionary
+        self.dictionary_id = hashlib.sha256(dictionary).hexdigest()[:8] if dictionary else None
+        self.algorithm = "zstd" if zstandard else "zlib"
+        self._zstd_dict = (
+            zstandard.ZstdCompressionDict(dictionary) if zstandard and dictionary else None
+        )
+
+    @property
+    def encoding(self) -> str:
+        if self.dictionary_id:
+            return f"{self.algorithm}+dict:{self.dictionary_id}"
+        return self.algorithm
+
+    def encode(self, text: str) -> Tuple[str, str]:
+        """Return (encoding, payload) for storage"""
+        raw = text.encode()
+        if len(raw) < self.min_bytes:
+            return IDENTITY, text
+
+        compressed = self._compress(raw)
+        if len(compressed) >= len(raw):
+            return IDENTITY, text
+        return self.encoding, base64.b64encode(compressed).decode("ascii")
+
+    def decode(self, encoding: Optional[str], payload: str) -> str:
+        if not encoding or encoding == IDENTITY:
+            return payload
+
+        algorithm, _, dictionary_tag = encoding.partition("+dict:")
+        if dictionary_tag and dictionary_tag != self.dictionary_id:
+            raise ValueError(f"Payload needs compression dictionary {dictionary_tag}")
+
+        compressed = base64.b64decode(payload)
+        if algorithm == "zstd":
+            if zstandard is None:
+                raise ValueError("zstandard is not installed")
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd_dict if dictionary_tag else None)
+            return decompressor.decompress(compressed).decode()
+        if algorithm == "zlib":
+            decompressor = zlib.decompressobj(zdict=self.dictionary) if dictionary_tag else zlib.decompressobj()
+            return (decompressor.decompress(compressed) + decompressor.flush()).decode()
+        raise ValueError(f"Unknown payload encoding {encoding}")
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self._zstd_dict)
+            return compressor.compress(raw)
+        compressor = (
+            zlib.compressobj(self.level, zdict=self.dictionary) if self.dictionary
+            else zlib.compressobj(self.level)
+        )
+        return compressor.compress(raw) + compressor.flush()
+
+def _load_dictionary() -> Optional[bytes]:
+    if not settings.CACHE_COMPRESSION_DICT_PATH:
+        return None
+    try:
+        with open(settings.CACHE_COMPRESSION_DICT_PATH, "rb") as f:
+            return f.read()
+    except OSError as e:
+        print(f"Compression dictionary not loaded: {e}")
+        return None
+
+payload_codec = PayloadCodec(_load_dictionary(), settings.CACHE_COMPRESSION_MIN_BYTES)
\ No newline at end of file
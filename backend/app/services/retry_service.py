@@ -1,15 +1,123 @@
 import asyncio
-from typing import TypeVar, Callable, Awaitable
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import TypeVar, Callable, Awaitable, Dict, Optional
 from app.core.config import settings
 
 T = TypeVar('T')
 
+class AdaptiveRateLimiter:
+    """Token bucket plus AIMD concurrency limit for one LLM provider.
+
+    Concurrency grows additively while calls succeed and is cut
+    multiplicatively when the provider answers with a rate limit.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        initial_concurrency: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 2.0  # seconds
+    ):
+        self.rate = requests_per_minute / 60.0
+        self.burst = max(1.0, self.rate)
+        self.tokens = self.burst
+        self.concurrency_limit = float(initial_concurrency)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._slots = asyncio.Condition()
+        self._bucket = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._slots:
+            await self._slots.wait_for(lambda: self.in_flight < int(self.concurrency_limit))
+            self.in_flight += 1
+
+        try:
+            async with self._bucket:
+                while True:
+                    now = time.monotonic()
+                    self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+                    self._last_refill = now
+                    if now >= self.paused_until and self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    await asyncio.sleep(max(self.paused_until - now, (1 - self.tokens) / self.rate))
+        except BaseException:
+            await self.release()
+            raise
+
+    async def release(self):
+        async with self._slots:
+            self.in_flight -= 1
+            self._slots.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
+    def record_success(self):
+        # Roughly +1 per full window of successful calls
+        self.concurrency_limit = min(
+            self.max_concurrency,
+            self.concurrency_limit + 1 / self.concurrency_limit
+        )
+
+    def record_rate_limited(self, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        if retry_after:
+            self.paused_until = max(self.paused_until, now + retry_after)
+        # One burst of 429s from in-flight calls counts as a single congestion signal
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self.concurrency_limit = max(
+            self.min_concurrency,
+            self.concurrency_limit * self.decrease_factor
+        )
+        self.tokens = 0
+
 class RetryService:
     def __init__(self):
         self.max_attempts = 5
         self.initial_delay = 1.0  # seconds
         self.max_delay = 30.0  # seconds
         self.multiplier = 2.0
+        self.limiters: Dict[str, AdaptiveRateLimiter] = {
+            "openai": AdaptiveRateLimiter(
+                self._process_share(settings.OPENAI_REQUESTS_PER_MINUTE),
+                settings.LLM_INITIAL_CONCURRENCY,
+                settings.LLM_MAX_CONCURRENCY
+            ),
+            "anthropic": AdaptiveRateLimiter(
+                self._process_share(settings.ANTHROPIC_REQUESTS_PER_MINUTE),
+                settings.LLM_INITIAL_CONCURRENCY,
+                settings.LLM_MAX_CONCURRENCY
+            )
+        }
+
+    def _process_share(self, requests_per_minute: int) -> float:
+        """This process's slice of an account-wide quota; every API and worker process runs its own bucket"""
+        processes = settings.LLM_RATE_LIMIT_PROCESSES or settings.JOB_WORKER_PROCESSES + 1
+        return requests_per_minute / max(1, processes)
+
+    def limiter(self, provider: str) -> AdaptiveRateLimiter:
+        """Get the shared rate limiter in front of a provider's API"""
+        return self.limiters[provider]
 
     async def with_retry(
         self,
@@ -18,7 +126,7 @@ class RetryService:
         on_attempt: Callable[[int, float], None] = None,
         **kwargs
     ) -> T:
-        """Execute an operation with exponential backoff retry"""
+        """Execute an operation with jittered exponential backoff retry"""
         attempt = 1
         delay = self.initial_delay
 
@@ -40,15 +148,16 @@ class RetryService:
                 if attempt >= self.max_attempts:
                     raise e
             
-            # Calculate next delay
+            # Calculate next delay, jittered so concurrent books don't retry in lockstep
             delay = min(delay * self.multiplier, self.max_delay)
+            jittered_delay = random.uniform(delay / 2, delay)
             
             # Notify about retry
             if on_attempt:
-                on_attempt(attempt, delay)
+                on_attempt(attempt, jittered_delay)
             
             # Wait before next attempt
-            await asyncio.sleep(delay)
+            await asyncio.sleep(jittered_delay)
             attempt += 1
 
     def calculate_backoff_delay(self, attempt: int) -> float:
@@ -0,0 +1,147 @@
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+class MinHashIndex:
+    """Local MinHash/LSH index for finding near-duplicate prompts.
+
+    Prompts are normalized (case, punctuation, whitespace) and shingled into
+    character n-grams. LSH buckets give candidates, which are then checked
+    against the similarity threshold using the estimated Jaccard similarity.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 5,
+        max_entries: int = 10000,
+        ttl: timedelta = timedelta(hours=24)
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # Fixed seed so signatures are stable across processes
+        generator = random.Random(1)
+        self._permutations = [
+            (generator.randrange(1, _MERSENNE_PRIME), generator.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._entries: OrderedDict[str, Tuple[Tuple[int, ...], str, float, datetime]] = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+
+    def _normalize(self, text: str) -> str:
+        text = re.sub(r"[^\w\s]", " ", text.lower())
+        return re.sub(r"\s+", " ", text).strip()
+
+    def _shingles(self, text: str) -> Set[bytes]:
+        text = self._normalize(text)
+        if len(text) <= self.shingle_size:
+            return {text.encode()}
+        return {
+            text[i:i + self.shingle_size].encode()
+            for i in range(len(text) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+            for shingle in self._shingles(text)
+        ]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        return sum(a == b for a, b in zip(first, second)) / self.num_perm
+
+    def add(self, key: str, text: str, output: str, score: float) -> None:
+        if key in self._entries:
+            self._remove(key)
+        while len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+        signature = self.signature(text)
+        self._entries[key] = (signature, output, score, datetime.utcnow() + self.ttl)
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def query(self, text: str) -> Optional[Tuple[str, float, float]]:
+        """Return (output, score, similarity) of the closest entry above the threshold"""
+        signature = self.signature(text)
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(signature):
+            candidates |= self._buckets.get(band_key, set())
+
+        now = datetime.utcnow()
+        best: Optional[Tuple[str, float, float]] = None
+        best_key = None
+        for key in candidates:
+            entry_signature, output, score, expires_at = self._entries[key]
+            if expires_at <= now:
+                self._remove(key)
+                continue
+            similarity = self.similarity(signature, entry_signature)
+            if similarity >= self.threshold and (best is None or similarity > best[2]):
+                best = (output, score, similarity)
+                best_key = key
+
+        if best_key is not None:
+            self._entries.move_to_end(best_key)
+        return best
+
+    def _remove(self, key: str) -> None:
+        signature = self._entries.pop(key)[0]
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SimilarityCache:
+    """Opt-in near-duplicate cache for outliner prompts"""
+
+    def __init__(self):
+        self.enabled = settings.OUTLINER_SIMILARITY_CACHE
+        self.index = MinHashIndex(
+            threshold=settings.OUTLINER_SIMILARITY_THRESHOLD,
+            max_entries=settings.OUTLINER_SIMILARITY_MAX_ENTRIES
+        )
+
+    def get(self, prompt: str) -> Optional[Tuple[str, float, float]]:
+        if not self.enabled:
+            return None
+        return self.index.query(prompt)
+
+    def put(self, prompt: str, output: str, score: float) -> None:
+        if not self.enabled:
+            return
+        self.index.add(hashlib.sha256(prompt.encode()).hexdigest(), prompt, output, score)
+
+similarity_cache = SimilarityCache()
\ No newline at end of file
@@ -0,0 +1,30 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+from app.core.config import settings
+
+class SupabaseExecutor:
+    """Runs blocking supabase-py queries in a bounded thread pool.
+
+    The sync client's .execute() would otherwise stall the event loop, and
+    every SSE stream with it, for the length of each network round trip.
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="supabase")
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def execute(self, query: Any, timeout: Optional[float] = None) -> Any:
+        """Execute a built supabase query without blocking the event loop"""
+        timeout = timeout or self.timeout
+        await asyncio.wait_for(self._slots.acquire(), timeout)
+        future = asyncio.get_running_loop().run_in_executor(self._executor, query.execute)
+        # The slot is held until the thread finishes, even if the caller times out
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+supabase_executor = SupabaseExecutor(settings.SUPABASE_MAX_CONCURRENCY, settings.SUPABASE_TIMEOUT)
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Book generation worker.
+
+Runs generation jobs from the durable job queue outside the web tier:
+
+    python -m app.worker --processes 2 --concurrency 4
+
+Progress events are published in the worker process, so SSE clients connected
+to the API (/events/{book_id}) only see them through a cross-process event
+broker. Workers refuse to start with EVENT_BROKER=memory.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+from .core.config import settings
+from .database import SessionLocal
+from .services.book_service import BookService
+from .services.job_queue import JobQueue
+from .services.event_service import event_service
+
+async def _heartbeat(job_id: int, worker_id: str, generation: asyncio.Task):
+    """Keep extending the job lease; stop the generation if another worker took the job"""
+    while True:
+        await asyncio.sleep(settings.JOB_VISIBILITY_TIMEOUT / 3)
+        db = SessionLocal()
+        try:
+            if not await JobQueue(db).heartbeat(job_id, worker_id):
+                print(f"Worker {worker_id} lost the lease on job {job_id}, cancelling it")
+                generation.cancel()
+                return
+        finally:
+            db.close()
+
+async def _generate(book_id: int):
+    db = SessionLocal()
+    try:
+        await BookService(db).generate_book(book_id)
+    finally:
+        db.close()
+
+async def _process_job(job_id: int, book_id: int, worker_id: str):
+    generation = asyncio.create_task(_generate(book_id))
+    heartbeat = asyncio.create_task(_heartbeat(job_id, worker_id, generation))
+    db = SessionLocal()
+    try:
+        try:
+            await generation
+        except asyncio.CancelledError:
+            print(f"Job {job_id} for book {book_id} stopped after losing its lease")
+            return
+        except Exception as e:
+            print(f"Job {job_id} for book {book_id} failed: {e}")
+            if not await JobQueue(db).fail(job_id, worker_id, str(e)):
+                print(f"Job {job_id} is owned by another worker, not requeueing it")
+            return
+
+        if not await JobQueue(db).complete(job_id, worker_id):
+            print(f"Job {job_id} is owned by another worker, not marking it completed")
+    finally:
+        heartbeat.cancel()
+        if not generation.done():
+            generation.cancel()
+        db.close()
+
+async def run_worker(worker_id: str, concurrency: int):
+    """Claim and run jobs until stopped, with at most `concurrency` in flight"""
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    # Progress events reach SSE clients on the API processes through the broker
+    await event_service.start()
+
+    slots = asyncio.Semaphore(concurrency)
+    in_flight: set[asyncio.Task] = set()
+
+    while not stopping.is_set():
+        await slots.acquire()
+        db = SessionLocal()
+        try:
+            job = await JobQueue(db).claim(worker_id)
+            claimed = (job.id, job.book_id) if job else None
+        finally:
+            db.close()
+
+        if not claimed:
+            slots.release()
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=settings.JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(_process_job(*claimed, worker_id))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        task.add_done_callback(lambda _: slots.release())
+
+    # Let running generations finish; unfinished leases expire and are retried elsewhere
+    if in_flight:
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    await event_service.stop()
+
+def _worker_main(index: int, concurrency: int):
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{index}"
+    print(f"Worker {worker_id} started with concurrency {concurrency}")
+    asyncio.run(run_worker(worker_id, concurrency))
+
+def main():
+    if settings.EVENT_BROKER == "memory":
+        raise SystemExit(
+            "EVENT_BROKER=memory keeps progress events inside the worker process; "
+            "set EVENT_BROKER=postgres so SSE clients on the API receive them"
+        )
+    parser = argparse.ArgumentParser(description="Run book generation workers")
+    parser.add_argument("--processes", type=int, default=settings.JOB_WORKER_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    processes = [
+        multiprocessing.Process(target=_worker_main, args=(index, args.concurrency))
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    # Forward termination so every worker drains its in-flight jobs
+    signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
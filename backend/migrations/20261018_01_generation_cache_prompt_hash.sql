@@ -0,0 +1,34 @@
+-- Key generation_cache on a content hash instead of the full prompt text
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+CREATE TABLE IF NOT EXISTS generation_cache (
+    id BIGSERIAL PRIMARY KEY,
+    prompt TEXT,
+    agent_type TEXT NOT NULL,
+    output TEXT NOT NULL,
+    score DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+ALTER TABLE generation_cache ADD COLUMN IF NOT EXISTS prompt_hash TEXT;
+
+-- Backfill existing rows; matches hashlib.sha256(prompt.encode()).hexdigest()
+UPDATE generation_cache
+SET prompt_hash = encode(digest(prompt, 'sha256'), 'hex')
+WHERE prompt_hash IS NULL;
+
+-- Keep only the newest entry per key before adding the unique index
+DELETE FROM generation_cache older
+USING generation_cache newer
+WHERE older.prompt_hash = newer.prompt_hash
+  AND older.agent_type = newer.agent_type
+  AND (older.created_at, older.id) < (newer.created_at, newer.id);
+
+ALTER TABLE generation_cache ALTER COLUMN prompt_hash SET NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_generation_cache_prompt_hash_agent_type
+ON generation_cache(prompt_hash, agent_type);
+
+CREATE INDEX IF NOT EXISTS idx_generation_cache_expires_at
+ON generation_cache(expires_at);
\ No newline at end of file
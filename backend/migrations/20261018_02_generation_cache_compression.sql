@@ -0,0 +1,3 @@
+-- Cached outputs may be stored compressed; output_encoding says how to decode them
+ALTER TABLE generation_cache
+ADD COLUMN IF NOT EXISTS output_encoding TEXT NOT NULL DEFAULT 'identity';
\ No newline at end of file
@@ -0,0 +1,35 @@
+-- Frequently requested cache entries that are about to expire, for the off-peak warm-up job
+CREATE INDEX IF NOT EXISTS idx_analytics_events_metric_type_timestamp
+ON analytics_events(metric_type, timestamp);
+
+CREATE OR REPLACE FUNCTION cache_warmup_candidates(
+    lookback_hours INTEGER,
+    expiring_within_hours INTEGER,
+    min_requests INTEGER,
+    max_age_hours INTEGER,
+    max_rows INTEGER
+)
+RETURNS TABLE (
+    prompt_hash TEXT,
+    agent_type TEXT,
+    expires_at TIMESTAMP WITH TIME ZONE,
+    request_count BIGINT
+) AS $$
+    SELECT c.prompt_hash, c.agent_type, c.expires_at, f.request_count
+    FROM (
+        SELECT e.prompt_hash, e.agent_type, COUNT(*) AS request_count
+        FROM analytics_events e
+        WHERE e.metric_type IN ('cache_hit', 'cache_miss')
+          AND e.prompt_hash IS NOT NULL
+          AND e.timestamp >= NOW() - make_interval(hours => lookback_hours)
+        GROUP BY e.prompt_hash, e.agent_type
+        HAVING COUNT(*) >= min_requests
+    ) f
+    JOIN generation_cache c
+      ON c.prompt_hash = f.prompt_hash AND c.agent_type = f.agent_type
+    WHERE c.expires_at > NOW()
+      AND c.expires_at <= NOW() + make_interval(hours => expiring_within_hours)
+      AND c.created_at >= NOW() - make_interval(hours => max_age_hours)
+    ORDER BY f.request_count DESC
+    LIMIT max_rows;
+$$ LANGUAGE sql STABLE;
\ No newline at end of file
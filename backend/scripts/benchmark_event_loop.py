@@ -0,0 +1,90 @@
+"""
+Measure event-loop lag while cache lookups hit Supabase.
+
+Simulates supabase-py's blocking .execute() with a fixed round-trip delay and
+compares calling it directly on the loop (the old behaviour) against running
+it through SupabaseExecutor:
+
+    python scripts/benchmark_event_loop.py --latency-ms 40 --requests 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.supabase_executor import SupabaseExecutor
+
+class FakeQuery:
+    """Stands in for a built supabase query; execute() blocks like a network call"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def execute(self):
+        time.sleep(self.latency)
+        return {"data": []}
+
+async def _monitor_lag(interval: float, lags: list, stop: asyncio.Event):
+    """Record how late the loop wakes a task that asked to sleep for `interval`"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started - interval) * 1000)
+
+async def _run(mode: str, args) -> dict:
+    executor = SupabaseExecutor(args.workers, timeout=30.0)
+    slots = asyncio.Semaphore(args.concurrency)
+    lags: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_lag(args.interval_ms / 1000, lags, stop))
+
+    async def lookup():
+        async with slots:
+            query = FakeQuery(args.latency_ms / 1000)
+            if mode == "direct":
+                query.execute()
+            else:
+                await executor.execute(query)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(lookup() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+    executor.shutdown()
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "elapsed_s": elapsed,
+        "throughput_rps": args.requests / elapsed,
+        "lag_p50_ms": statistics.median(lags) if lags else 0.0,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] if lags else 0.0,
+        "lag_max_ms": lags[-1] if lags else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event-loop lag for Supabase calls")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for mode in ("direct", "executor"):
+        result = asyncio.run(_run(mode, args))
+        print(
+            f"{result['mode']:>8}: {result['elapsed_s']:.2f}s "
+            f"({result['throughput_rps']:.0f} req/s), loop lag "
+            f"p50={result['lag_p50_ms']:.1f}ms p99={result['lag_p99_ms']:.1f}ms "
+            f"max={result['lag_max_ms']:.1f}ms"
+        )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Benchmark concurrent SSE subscribers against /events/{book_id}.
+
+Starts a uvicorn server with the events router (plus a publish endpoint used
+only by the benchmark) in a subprocess, opens raw HTTP connections to one
+book's event stream, then publishes events and measures:
+
+- server RSS per open connection (from /proc/<pid>/status, Linux only)
+- publish-to-receive latency across all subscribers
+
+    python scripts/benchmark_sse.py --connections 10000 --events 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+BOOK_ID = 1
+
+def _raise_file_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+def _rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+def serve(port: int, backlog: int):
+    """Server side: the real events router plus a benchmark-only publish endpoint"""
+    import uvicorn
+    from fastapi import FastAPI
+    from app.models import BookStatus
+    from app.routers import events
+    from app.services.event_service import event_service
+
+    _raise_file_limit()
+    app = FastAPI()
+    app.include_router(events.router)
+
+    @app.on_event("startup")
+    async def start_broker():
+        await event_service.start()
+
+    @app.post("/bench/publish/{book_id}")
+    async def publish(book_id: int):
+        await event_service.publish(book_id, {
+            "status": BookStatus.GENERATING,
+            "progress": "benchmark",
+            "sent_at": time.time()
+        })
+        return {"subscribers": event_service.metrics()["subscribers"]}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=backlog)
+
+async def _request(port: int, method: str, path: str) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+async def _subscriber(port: int, connected: asyncio.Event, latencies: list, expected: int):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /events/{BOOK_ID} HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n".encode())
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    connected.set()
+
+    received = 0
+    try:
+        while received < expected:
+            line = await reader.readline()
+            if not line:
+                break
+            # Chunked framing lines are skipped; each event arrives whole in one chunk
+            if line.startswith(b"data: "):
+                event = json.loads(line[6:])
+                if "sent_at" in event:
+                    latencies.append(time.time() - event["sent_at"])
+                    received += 1
+    finally:
+        writer.close()
+
+async def run_client(args, server_pid: int):
+    baseline_kib = _rss_kib(server_pid)
+    latencies: list = []
+    subscribers = []
+    opened = 0
+
+    # Connect in batches so the listen backlog is never overrun
+    started = time.perf_counter()
+    while opened < args.connections:
+        batch = min(args.batch, args.connections - opened)
+        events = [asyncio.Event() for _ in range(batch)]
+        subscribers += [
+            asyncio.create_task(_subscriber(args.port, event, latencies, args.events))
+            for event in events
+        ]
+        await asyncio.gather(*(event.wait() for event in events))
+        opened += batch
+    connect_time = time.perf_counter() - started
+
+    await asyncio.sleep(1)
+    connected_kib = _rss_kib(server_pid)
+
+    for _ in range(args.events):
+        await _request(args.port, "POST", f"/bench/publish/{BOOK_ID}")
+        await asyncio.sleep(args.publish_interval)
+
+    await asyncio.wait_for(asyncio.gather(*subscribers, return_exceptions=True), timeout=args.timeout)
+    metrics = json.loads((await _request(args.port, "GET", "/events/metrics")).split(b"\r\n\r\n", 1)[1])
+
+    latencies.sort()
+    expected = args.connections * args.events
+    print(f"connections:        {args.connections} (opened in {connect_time:.1f}s)")
+    print(f"server RSS:         {baseline_kib / 1024:.1f} MiB idle, {connected_kib / 1024:.1f} MiB connected")
+    print(f"RSS per connection: {(connected_kib - baseline_kib) * 1024 / args.connections / 1024:.1f} KiB")
+    print(f"events received:    {len(latencies)} of {expected}")
+    if latencies:
+        print(
+            f"publish->receive:   p50={statistics.median(latencies) * 1000:.1f}ms "
+            f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms "
+            f"max={latencies[-1] * 1000:.1f}ms"
+        )
+    print(f"server dropped:     {metrics['dropped']}, disconnected: {metrics['disconnected']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SSE subscribers")
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--publish-interval", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.connections)
+        return
+
+    limit = _raise_file_limit()
+    if limit < args.connections + 100:
+        sys.exit(f"RLIMIT_NOFILE is {limit}; raise the hard limit to open {args.connections} connections")
+
+    server = subprocess.Popen([
+        sys.executable, __file__, "--serve",
+        "--port", str(args.port), "--connections", str(args.connections)
+    ])
+    try:
+        # Wait for the server to accept connections
+        for _ in range(100):
+            try:
+                asyncio.run(_request(args.port, "GET", "/events/metrics"))
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(run_client(args, server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Delete artifact store files that no book or checkpoint references any more.
+
+Artifacts are shared by content digest, so they can only be removed after a
+full scan of every reference. Run it from cron on a host that mounts
+ARTIFACT_STORE_PATH, e.g. after checkpoints have been cleared:
+
+    python scripts/gc_artifacts.py             # sweep unreferenced artifacts
+    python scripts/gc_artifacts.py --dry-run   # only report the live count
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models import Book, GenerationCheckpoint
+from app.services.artifact_store import artifact_store
+
+def live_digests() -> set:
+    db = SessionLocal()
+    try:
+        digests = set()
+        for (content,) in db.query(Book.content).filter(Book.content.isnot(None)).yield_per(500):
+            digests |= artifact_store.referenced_digests(content)
+        for (output,) in db.query(GenerationCheckpoint.output).yield_per(500):
+            digests |= artifact_store.referenced_digests(output)
+        return digests
+    finally:
+        db.close()
+
+def gc_artifacts(dry_run: bool):
+    live = live_digests()
+    if dry_run:
+        print(f"{len(live)} artifacts are referenced")
+        return
+    removed = artifact_store.gc(live, settings.ARTIFACT_GC_GRACE_SECONDS)
+    print(f"Removed {removed} unreferenced artifact files, kept {len(live)} referenced")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete unreferenced artifact store files")
+    parser.add_argument("--dry-run", action="store_true", help="count references without deleting")
+    args = parser.parse_args()
+    gc_artifacts(args.dry_run)
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Extend hot generation cache entries before they expire.
+
+Meant to be run from cron during the off-peak window configured by
+CACHE_WARMUP_OFF_PEAK_START_HOUR / CACHE_WARMUP_OFF_PEAK_END_HOUR:
+
+    python scripts/warm_cache.py           # no-op outside the window
+    python scripts/warm_cache.py --force   # run now regardless of the hour
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.cache_warmer import cache_warmer
+
+async def warm_cache(force: bool):
+    if not force and not cache_warmer.is_off_peak():
+        print("Outside the off-peak window, skipping cache warm-up")
+        return
+    result = await cache_warmer.warm(force=True)
+    print(f"Extended {result['extended']} of {result['candidates']} expiring cache entries")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extend frequently requested cache entries")
+    parser.add_argument("--force", action="store_true", help="ignore the off-peak window")
+    args = parser.parse_args()
+    asyncio.run(warm_cache(args.force))
\ No newline at end of file
@@ -0,0 +1,12 @@
+import os
+
+# Settings are validated at import time; tests never reach the real services
+for name, value in {
+    "OPENAI_API_KEY": "test",
+    "CLAUDE_API_KEY": "test",
+    "DATABASE_URL": "sqlite://",
+    "JWT_SECRET": "test",
+    "SUPABASE_URL": "http://localhost",
+    "SUPABASE_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
\ No newline at end of file
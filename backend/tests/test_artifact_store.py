@@ -0,0 +1,82 @@
+import os
+import time
+import pytest
+from app.services.artifact_store import ArtifactMissingError, ArtifactStore
+
+def test_identical_content_is_stored_once(tmp_path):
+    """Artifacts are keyed by content, so repeated writes share one file"""
+    store = ArtifactStore(str(tmp_path), inline_max_bytes=0)
+    first = store.put(b"chapter one")
+    second = store.put(b"chapter one")
+    assert first == second
+    files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert files == [first]
+
+def test_small_outputs_stay_inline(tmp_path):
+    """Only outputs at or above the inline limit become references"""
+    store = ArtifactStore(str(tmp_path), inline_max_bytes=16)
+    assert store.externalize("short") == "short"
+    assert store.externalize({"not": "text"}) == {"not": "text"}
+
+    ref = store.externalize("x" * 16)
+    assert store.is_ref(ref)
+    assert ref["size"] == 16
+
+def test_resolve_round_trips_nested_references(tmp_path):
+    """Book content dicts resolve back to the original text"""
+    store = ArtifactStore(str(tmp_path), inline_max_bytes=4)
+    manuscript = "Ünïcode manuscript " * 1000
+    content = {
+        "structure": store.externalize("outline text"),
+        "content": store.externalize(manuscript),
+        "chapters": [store.externalize("one"), store.externalize("chapter two")]
+    }
+    assert store.resolve(content) == {
+        "structure": "outline text",
+        "content": manuscript,
+        "chapters": ["one", "chapter two"]
+    }
+
+def test_empty_artifact_can_be_read(tmp_path):
+    """Zero-length files cannot be mapped but still read back"""
+    store = ArtifactStore(str(tmp_path), inline_max_bytes=0)
+    assert store.read_text(store.put(b"")) == ""
+
+def test_relative_root_is_rejected():
+    """The API and workers must agree on one shared directory"""
+    with pytest.raises(ValueError):
+        ArtifactStore("artifacts", inline_max_bytes=0)
+
+def test_missing_artifact_raises_a_store_error(tmp_path):
+    store = ArtifactStore(str(tmp_path), inline_max_bytes=0)
+    ref = store.externalize("manuscript")
+    os.unlink(store._path(ref["artifact"]))
+
+    with pytest.raises(ArtifactMissingError):
+        store.resolve({"content": ref})
+
+def test_iter_text_decodes_across_chunk_boundaries(tmp_path):
+    """Multi-byte characters split between chunks are still decoded once"""
+    store = ArtifactStore(str(tmp_path), inline_max_bytes=0)
+    text = "Ünïcode — manuscript " * 50
+    digest = store.put(text.encode())
+
+    chunks = list(store.iter_text(digest, chunk_size=7))
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+
+def test_gc_removes_only_old_unreferenced_artifacts(tmp_path):
+    store = ArtifactStore(str(tmp_path), inline_max_bytes=0)
+    live = store.externalize("kept chapter")
+    dead = store.put(b"cleared checkpoint")
+    fresh = store.put(b"written but not yet committed")
+    old = time.time() - 120
+    for digest in (live["artifact"], dead):
+        os.utime(store._path(digest), (old, old))
+
+    digests = store.referenced_digests({"structure": "inline", "content": [live]})
+    assert store.gc(digests, grace_seconds=60) == 1
+
+    assert store.exists(live["artifact"])
+    assert store.exists(fresh)
+    assert not store.exists(dead)
\ No newline at end of file
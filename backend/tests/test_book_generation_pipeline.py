@@ -0,0 +1,57 @@
+import asyncio
+import json
+from app.services.ai.core.pipeline import BookGenerationPipeline
+from app.services.ai.models.base import AIModel
+from app.services.event_service import event_service
+
+OUTLINE = "Outline\n\nChapter 1: Arrival\nShe arrives.\n\nChapter 2: Departure\nShe leaves.\n"
+BOOK = {"id": 4242, "genre": "Drama", "style": "Spare", "tone": "Quiet", "target_audience": "Adult"}
+
+class StreamingWriter(AIModel):
+    """Streams each chapter word by word, tracking how many run at once"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def generate(self, prompt: str) -> str:
+        raise AssertionError("chapters should be streamed")
+
+    async def generate_stream(self, prompt: str):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        chapter = "one" if "chapter 1 of" in prompt else "two"
+        for word in ["Body ", "of ", chapter]:
+            await asyncio.sleep(0)
+            yield word
+        self.running -= 1
+
+    async def analyze(self, content: str):
+        return {}
+
+def test_chapters_are_written_in_parallel_by_default():
+    assert BookGenerationPipeline().parallel_chapters
+
+async def test_chapters_stream_concurrently_and_reassemble_in_order():
+    pipeline = BookGenerationPipeline()
+    writer = pipeline.models['writing'] = StreamingWriter()
+    subscription = await event_service.subscribe(BOOK["id"])
+    try:
+        content = await pipeline._write_chapters(
+            BOOK["id"], OUTLINE, ["Chapter 1: Arrival\nShe arrives.", "Chapter 2: Departure\nShe leaves."],
+            {}, BOOK
+        )
+        await event_service.flush(BOOK["id"])
+
+        assert content == "Chapter 1: Arrival\n\nBody of one\n\nChapter 2: Departure\n\nBody of two"
+        assert writer.peak == 2
+
+        deltas = {}
+        while len(subscription):
+            _, payload = await subscription.get()
+            event = json.loads(payload)
+            if "delta" in event:
+                deltas[event["chapter"]] = deltas.get(event["chapter"], "") + event["delta"]
+        assert deltas == {0: "Body of one", 1: "Body of two"}
+    finally:
+        await event_service.unsubscribe(BOOK["id"], subscription)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, Book, BookStatus, GenerationCheckpoint
+from app.services import checkpoint_service as checkpoint_module
+from app.services.book_service import BookService
+
+STAGES = ["outline", "content", "enhanced_content", "final_content"]
+
+class FakeGenerator:
+    async def generate_outline(self, book_data):
+        return "outline"
+
+    async def generate_content(self, outline, book_data):
+        return "content"
+
+    async def enhance_dialogues(self, content, book_id):
+        return "enhanced"
+
+    async def final_review(self, content, book_id):
+        return "final"
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(checkpoint_module, "SessionLocal", factory)
+    db = factory()
+    db.add(Book(title="The Long Road"))
+    db.commit()
+    db.close()
+    return factory
+
+def book_service(db) -> BookService:
+    service = BookService.__new__(BookService)
+    service.db = db
+    service.generator = FakeGenerator()
+    return service
+
+def checkpoint_stages(factory) -> list:
+    db = factory()
+    try:
+        return sorted(c.stage for c in db.query(GenerationCheckpoint).all())
+    finally:
+        db.close()
+
+async def test_checkpoints_are_cleared_after_the_book_is_committed(session_factory):
+    db = session_factory()
+    await book_service(db).generate_book(1)
+
+    assert db.get(Book, 1).status == BookStatus.COMPLETED
+    assert checkpoint_stages(session_factory) == []
+    db.close()
+
+async def test_failed_final_commit_keeps_the_checkpoints(session_factory, monkeypatch):
+    """If the finished book never reaches the database, the next run can still resume"""
+    db = session_factory()
+    commit = db.commit
+
+    def failing_commit():
+        if db.get(Book, 1).status == BookStatus.COMPLETED:
+            raise RuntimeError("database went away")
+        commit()
+
+    monkeypatch.setattr(db, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        await book_service(db).generate_book(1)
+
+    assert checkpoint_stages(session_factory) == sorted(STAGES)
+    db.expire_all()
+    book = db.get(Book, 1)
+    assert book.status == BookStatus.FAILED
+    assert book.content is None
+    db.close()
\ No newline at end of file
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from app.services.cache_admission import CostAwareAdmission, CountMinSketch, LocalCacheTier
+
+EXPIRES = datetime.utcnow() + timedelta(hours=1)
+
+class FakeAnalytics:
+    def __init__(self, frequencies, seconds=1.0):
+        self.frequencies = frequencies
+        self.seconds = seconds
+
+    def estimate_request_frequency(self, prompt_hash):
+        return self.frequencies.get(prompt_hash, 0)
+
+    def estimate_generation_time(self, agent_type, prompt_hash):
+        return self.seconds
+
+def test_sketch_never_undercounts():
+    sketch = CountMinSketch(width=64, depth=4)
+    for key, count in {"a": 5, "b": 2, "c": 9}.items():
+        for _ in range(count):
+            sketch.increment(key)
+
+    assert sketch.estimate("a") >= 5
+    assert sketch.estimate("b") >= 2
+    assert sketch.estimate("c") >= 9
+    assert sketch.estimate("missing") <= 16
+
+def test_sketch_halves_counts_after_sample_size():
+    sketch = CountMinSketch(width=1024, depth=4, sample_size=10)
+    for _ in range(9):
+        sketch.increment("hot")
+    assert sketch.estimate("hot") == 9
+
+    sketch.increment("hot")
+    assert sketch.estimate("hot") == 5
+    assert sketch.additions == 5
+
+def test_admission_values_frequency_times_generation_time():
+    admission = CostAwareAdmission(FakeAnalytics({"popular": 4, "rare": 1}, seconds=30.0), min_saved_seconds=60.0)
+
+    assert admission.value("writer", "popular") == 120.0
+    assert admission.admit("writer", "popular")
+    assert not admission.admit("writer", "rare")
+
+def test_local_tier_evicts_least_recently_used():
+    tier = LocalCacheTier(max_bytes=10)
+    tier.put(("writer", "a"), "aaaaa", 9.0, EXPIRES)
+    tier.put(("writer", "b"), "bbbbb", 9.0, EXPIRES)
+    tier.get(("writer", "a"))
+
+    assert tier.put(("writer", "c"), "ccccc", 9.0, EXPIRES) == 1
+    assert tier.get(("writer", "b")) is None
+    assert tier.get(("writer", "a")) == ("aaaaa", 9.0)
+    assert tier.size_bytes == 10
+
+def test_low_value_candidate_does_not_displace_valuable_entries():
+    admission = CostAwareAdmission(FakeAnalytics({"hot": 10, "cold": 1}), min_saved_seconds=0)
+    tier = LocalCacheTier(max_bytes=10, admission=admission)
+    tier.put(("writer", "hot"), "hhhhhhhh", 9.0, EXPIRES)
+
+    assert tier.put(("writer", "cold"), "cccccccc", 9.0, EXPIRES) == 0
+    assert tier.get(("writer", "cold")) is None
+    assert tier.get(("writer", "hot")) == ("hhhhhhhh", 9.0)
+
+def test_rejected_refresh_keeps_the_existing_entry():
+    """Growing an entry must not drop it when admission refuses the eviction"""
+    admission = CostAwareAdmission(FakeAnalytics({"cold": 1, "hot": 10}), min_saved_seconds=0)
+    tier = LocalCacheTier(max_bytes=10, admission=admission)
+    tier.put(("writer", "cold"), "old", 7.0, EXPIRES)
+    tier.put(("writer", "hot"), "hhhhh", 9.0, EXPIRES)
+
+    assert tier.put(("writer", "cold"), "new-longer", 8.0, EXPIRES) == 0
+    assert tier.get(("writer", "cold")) == ("old", 7.0)
+    assert tier.get(("writer", "hot")) == ("hhhhh", 9.0)
+    assert tier.size_bytes == 8
+
+def test_refresh_replaces_in_place_without_evicting():
+    tier = LocalCacheTier(max_bytes=10)
+    tier.put(("writer", "a"), "aaaaa", 7.0, EXPIRES)
+    tier.put(("writer", "b"), "bbbbb", 9.0, EXPIRES)
+
+    assert tier.put(("writer", "a"), "AAAAA", 8.0, EXPIRES) == 0
+    assert tier.get(("writer", "a")) == ("AAAAA", 8.0)
+    assert tier.get(("writer", "b")) == ("bbbbb", 9.0)
+    assert tier.size_bytes == 10
\ No newline at end of file
@@ -0,0 +1,82 @@
+from app.services.ai.utils.chapters import (
+    chapter_body, chapter_heading, chapters_below, chapters_to_refine, replace_chapter_body,
+    replace_chapters, split_chapters
+)
+
+def test_split_is_lossless_and_keeps_headings():
+    """Preamble and chapters join back into the original text"""
+    text = (
+        "# The Long Road\n\nA foreword.\n\n"
+        "## Chapter 1: Departure\n\nThey left at dawn.\n\n"
+        "**CHAPTER IV**\n\nThe storm.\n\n"
+        "Chapter Twenty-One - Home\nThe end.\n"
+    )
+    preamble, chapters = split_chapters(text)
+
+    assert preamble == "# The Long Road\n\nA foreword.\n\n"
+    assert preamble + "".join(chapters) == text
+    assert [chapter_heading(chapter) for chapter in chapters] == [
+        "## Chapter 1: Departure", "**CHAPTER IV**", "Chapter Twenty-One - Home"
+    ]
+
+def test_accepted_heading_forms():
+    for heading in ["Chapter 3", "Chapter 12.", "Chapter Three:", "chapter xiv", "Chapter One Hundred"]:
+        _, chapters = split_chapters(f"{heading}\nBody text.\n")
+        assert len(chapters) == 1, heading
+
+def test_prose_and_outline_headers_are_not_chapters():
+    """Words after "Chapter" that are not numbers do not start a chapter"""
+    text = (
+        "Chapter-by-chapter breakdown:\n"
+        "Chapter breakdown:\n"
+        "Chapter after chapter, the tension builds.\n"
+        "Chapter tenacity: a made-up word.\n"
+        "Chapter 2: The Real One\nBody.\n"
+    )
+    preamble, chapters = split_chapters(text)
+    assert len(chapters) == 1
+    assert chapter_heading(chapters[0]) == "Chapter 2: The Real One"
+    assert preamble.startswith("Chapter-by-chapter breakdown:")
+
+def test_text_without_chapters_is_all_preamble():
+    assert split_chapters("Just a short story.") == ("Just a short story.", [])
+
+MANUSCRIPT = (
+    "Title\n\n"
+    "Chapter 1: Strong\n\n  First body.\n\n"
+    "Chapter 2: Weak\n\nSecond body.  \n\n\n"
+    "Chapter 3: Weaker\nThird body.\n"
+)
+
+def test_weak_chapters_are_selected_by_overall_score():
+    scores = [{"overall": 9.5}, {"overall": 8.9}, {"overall": 4.0}]
+    assert chapters_below(scores, 9.0) == [1, 2]
+    assert chapters_below(scores, 4.0) == []
+
+def test_lowest_chapter_is_refined_when_none_are_below_threshold():
+    """A book below target whose chapters all pass still gets its weakest chapter refined"""
+    scores = [{"overall": 9.5}, {"overall": 9.1}, {"overall": 9.3}]
+    assert chapters_to_refine(scores, 9.0) == [1]
+    assert chapters_to_refine(scores, 9.0, fallback=2) == [1, 2]
+    assert chapters_to_refine(scores, 9.4) == [1, 2]
+    assert chapters_to_refine([], 9.0) == []
+
+def test_refined_chapters_splice_back_with_headings_and_whitespace():
+    """Only replaced chapters change; headings, spacing and untouched chapters are kept"""
+    preamble, chapters = split_chapters(MANUSCRIPT)
+    assert [chapter_body(chapter) for chapter in chapters] == ["First body.", "Second body.", "Third body."]
+
+    replacements = {
+        index: replace_chapter_body(chapters[index], f"  Better body {index}.\n")
+        for index in [1, 2]
+    }
+    assert replace_chapters(preamble, chapters, replacements) == (
+        "Title\n\n"
+        "Chapter 1: Strong\n\n  First body.\n\n"
+        "Chapter 2: Weak\n\nBetter body 1.  \n\n\n"
+        "Chapter 3: Weaker\nBetter body 2.\n"
+    )
+
+def test_replace_chapters_without_replacements_is_lossless():
+    preamble, chapters = split_chapters(MANUSCRIPT)
+    assert replace_chapters(preamble, chapters, {}) == MANUSCRIPT
\ No newline at end of file
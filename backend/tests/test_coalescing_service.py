@@ -0,0 +1,135 @@
+import asyncio
+import pytest
+from app.services.coalescing_service import CoalescingService
+
+async def test_concurrent_callers_share_one_run():
+    """Identical prompts run once and every caller gets the result"""
+    service = CoalescingService()
+    calls = 0
+    release = asyncio.Event()
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "outline"
+
+    callers = [asyncio.create_task(service.run("outliner", "a sci-fi novel", generate)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert service.in_flight_count() == 1
+    release.set()
+
+    results = await asyncio.gather(*callers)
+    assert calls == 1
+    assert results == ["outline"] * 5
+    assert service.in_flight_count() == 0
+
+async def test_different_prompts_or_agents_are_not_coalesced():
+    service = CoalescingService()
+
+    async def generate():
+        await asyncio.sleep(0.01)
+        return "result"
+
+    calls = 0
+
+    async def counted():
+        nonlocal calls
+        calls += 1
+        return await generate()
+
+    await asyncio.gather(
+        service.run("outliner", "prompt one", counted),
+        service.run("outliner", "prompt two", counted),
+        service.run("writer", "prompt one", counted)
+    )
+    assert calls == 3
+
+async def test_cancelled_caller_does_not_cancel_the_shared_generation():
+    """A waiter going away leaves the generation running for everyone else"""
+    service = CoalescingService()
+    release = asyncio.Event()
+
+    async def generate():
+        await release.wait()
+        return "draft"
+
+    leader = asyncio.create_task(service.run("writer", "outline", generate))
+    waiter = asyncio.create_task(service.run("writer", "outline", generate))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.gather(leader, return_exceptions=True)
+    release.set()
+
+    assert await waiter == "draft"
+
+async def test_errors_propagate_to_every_caller_and_are_not_cached():
+    service = CoalescingService()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("provider down")
+
+    callers = [asyncio.create_task(service.run("editor", "draft", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # The failed generation is not reused by later callers
+    async def succeeding():
+        return "edited"
+
+    assert await service.run("editor", "draft", succeeding) == "edited"
+
+async def test_sequential_calls_each_run():
+    service = CoalescingService()
+
+    async def generate():
+        return "outline"
+
+    assert await service.run("outliner", "prompt", generate) == "outline"
+    assert await service.run("outliner", "prompt", generate) == "outline"
+
+async def test_result_is_recorded_once_even_if_the_starting_caller_is_cancelled():
+    """Caching and metrics belong to the generation, not to the caller that started it"""
+    service = CoalescingService()
+    release = asyncio.Event()
+    recorded = []
+
+    async def generate():
+        await release.wait()
+        return "outline"
+
+    async def record(result):
+        recorded.append(result)
+
+    starter = asyncio.create_task(service.run("outliner", "prompt", generate, on_result=record))
+    follower = asyncio.create_task(service.run("outliner", "prompt", generate, on_result=record))
+    await asyncio.sleep(0)
+
+    starter.cancel()
+    await asyncio.gather(starter, return_exceptions=True)
+    release.set()
+
+    assert await follower == "outline"
+    await service.drain()
+    assert recorded == ["outline"]
+
+async def test_failed_generations_are_not_recorded():
+    service = CoalescingService()
+    recorded = []
+
+    async def failing():
+        raise RuntimeError("provider down")
+
+    async def record(result):
+        recorded.append(result)
+
+    with pytest.raises(RuntimeError):
+        await service.run("writer", "outline", failing, on_result=record)
+    await service.drain()
+    assert recorded == []
\ No newline at end of file
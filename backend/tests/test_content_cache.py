@@ -0,0 +1,73 @@
+import json
+from app.services.ai.utils.cache import ContentCache, LFUPolicy, LRUPolicy
+
+def entry_size(result) -> int:
+    return len(json.dumps(result).encode())
+
+RESULT = {"overall": 9.1}
+
+def test_hit_miss_counters_and_precomputed_hash():
+    cache = ContentCache()
+    content = "Chapter 1\nA long manuscript..."
+    content_hash = ContentCache.hash_content(content)
+
+    assert cache.get_cached_content(content, {"judge": "a"}) is None
+    cache.cache_content(content, {"judge": "a"}, RESULT, content_hash)
+
+    assert cache.get_cached_content(content, {"judge": "a"}) == RESULT
+    assert cache.get_cached_content(content, {"judge": "a"}, content_hash) == RESULT
+    # The context is part of the key
+    assert cache.get_cached_content(content, {"judge": "b"}) is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+def test_lru_evicts_least_recently_used_within_the_byte_budget():
+    cache = ContentCache(max_bytes=entry_size(RESULT) * 2, policy=LRUPolicy())
+    cache.cache_content("a", {}, RESULT)
+    cache.cache_content("b", {}, RESULT)
+    cache.get_cached_content("a", {})
+    cache.cache_content("c", {}, RESULT)
+
+    assert cache.get_cached_content("b", {}) is None
+    assert cache.get_cached_content("a", {}) == RESULT
+    assert cache.get_cached_content("c", {}) == RESULT
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["size_bytes"] == entry_size(RESULT) * 2
+
+def test_lfu_evicts_least_frequently_used():
+    cache = ContentCache(max_bytes=entry_size(RESULT) * 2, policy=LFUPolicy())
+    cache.cache_content("a", {}, RESULT)
+    cache.cache_content("b", {}, RESULT)
+    for _ in range(3):
+        cache.get_cached_content("b", {})
+    cache.get_cached_content("a", {})
+    cache.cache_content("c", {}, RESULT)
+
+    assert cache.get_cached_content("a", {}) is None
+    assert cache.get_cached_content("b", {}) == RESULT
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.services.ai.utils.cache.time.monotonic", lambda: now[0])
+    cache = ContentCache(ttl_seconds=60)
+    cache.cache_content("a", {}, RESULT)
+
+    now[0] += 59
+    assert cache.get_cached_content("a", {}) == RESULT
+    now[0] += 2
+    assert cache.get_cached_content("a", {}) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+def test_oversized_results_are_not_cached_and_clear_resets():
+    cache = ContentCache(max_bytes=4)
+    cache.cache_content("a", {}, RESULT)
+    assert cache.stats()["entries"] == 0
+
+    cache = ContentCache()
+    cache.cache_content("a", {}, RESULT)
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["size_bytes"] == 0
+    assert cache.get_cached_content("a", {}) is None
\ No newline at end of file
@@ -0,0 +1,49 @@
+from app.services.ai.models.base import AIModel
+from app.services.ai.quality.evaluator import QualityEvaluator
+from app.services.ai.refinement.editor import ContentEditor
+
+MANUSCRIPT = (
+    "Chapter 1: Opening\nsolid opening\n\n"
+    "Chapter 2: Middle\nsagging middle\n\n"
+    "Chapter 3: Ending\nstrong ending\n"
+)
+
+class ChapterJudge(AIModel):
+    """Scores chapters by a keyword in their text"""
+
+    SCORES = {"solid": 9.4, "sagging": 9.1, "strong": 9.8}
+
+    async def generate(self, prompt: str) -> str:
+        return ""
+
+    async def analyze(self, content: str):
+        score = next(score for word, score in self.SCORES.items() if word in content)
+        return {"technical": score, "literary": score, "emotional": score}
+
+def editor() -> ContentEditor:
+    content_editor = ContentEditor()
+    content_editor.evaluator = QualityEvaluator([ChapterJudge()])
+    refined = []
+
+    async def refine_chapter(chapter, metadata, scores):
+        refined.append(chapter.splitlines()[0])
+        return chapter.replace("Chapter", "Revised chapter", 1)
+
+    content_editor._refine_chapter = refine_chapter
+    content_editor.refined = refined
+    return content_editor
+
+async def test_only_chapters_below_threshold_are_refined():
+    content_editor = editor()
+    content = await content_editor.refine_chapters(MANUSCRIPT, {}, threshold=9.5)
+
+    assert content_editor.refined == ["Chapter 1: Opening", "Chapter 2: Middle"]
+    assert content.endswith("Chapter 3: Ending\nstrong ending\n")
+
+async def test_weakest_chapter_is_refined_when_all_pass_the_threshold():
+    """The book missed its target, so refining nothing would stall the caller's loop"""
+    content_editor = editor()
+    content = await content_editor.refine_chapters(MANUSCRIPT, {}, threshold=9.0)
+
+    assert content_editor.refined == ["Chapter 2: Middle"]
+    assert content != MANUSCRIPT
\ No newline at end of file
@@ -0,0 +1,55 @@
+import json
+import pytest
+from app.services.event_broker import PostgresBroker
+
+async def deliver(book_id: int, event_id: int, payload: str):
+    pass
+
+def test_small_events_are_sent_as_one_notification():
+    broker = PostgresBroker(deliver, "postgresql://localhost/test", "book_events")
+    messages = broker._split(7, 1, json.dumps({"progress": "Outline ready"}))
+    assert len(messages) == 1
+    assert broker._reassemble(json.loads(messages[0])) == json.dumps({"progress": "Outline ready"})
+
+def test_large_events_fit_the_notify_limit_and_reassemble():
+    """Events over the 8000 byte NOTIFY limit are split and rebuilt in order"""
+    broker = PostgresBroker(deliver, "postgresql://localhost/test", "book_events")
+    payload = json.dumps({"delta": "Ünïcode chapter text \"quoted\" " * 2000})
+    messages = broker._split(7, 1, payload)
+
+    assert len(messages) > 1
+    assert all(len(message.encode()) < 8000 for message in messages)
+
+    results = [broker._reassemble(json.loads(message)) for message in reversed(messages)]
+    assert results[:-1] == [None] * (len(messages) - 1)
+    assert results[-1] == payload
+    assert broker._parts == {}
+
+async def test_publish_before_start_raises():
+    broker = PostgresBroker(deliver, "postgresql://localhost/test", "book_events")
+    with pytest.raises(RuntimeError):
+        await broker.publish(7, 1, "{}")
+
+def test_incomplete_messages_expire(monkeypatch):
+    """Parts of a message whose publisher died are not kept forever"""
+    now = [100.0]
+    monkeypatch.setattr("app.services.event_broker.time.monotonic", lambda: now[0])
+    broker = PostgresBroker(deliver, "postgresql://localhost/test", "book_events")
+    payload = json.dumps({"delta": "x" * 10000})
+    orphan = broker._split(7, 1, payload)
+    assert broker._reassemble(json.loads(orphan[0])) is None
+    assert len(broker._parts) == 1
+
+    now[0] += broker.PARTS_TTL_SECONDS + 1
+    complete = broker._split(7, 2, payload)
+    results = [broker._reassemble(json.loads(message)) for message in complete]
+    assert results[-1] == payload
+    assert broker._parts == {}
+
+def test_pending_messages_are_bounded(monkeypatch):
+    monkeypatch.setattr(PostgresBroker, "MAX_PENDING_MESSAGES", 3)
+    broker = PostgresBroker(deliver, "postgresql://localhost/test", "book_events")
+    payload = json.dumps({"delta": "x" * 10000})
+    for event_id in range(5):
+        broker._reassemble(json.loads(broker._split(7, event_id, payload)[0]))
+    assert len(broker._parts) == 3
\ No newline at end of file
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from app.core.config import settings
+from app.models import BookStatus
+from app.services.event_service import EventService, OverflowPolicy
+
+def progress(text: str, delta: str = None) -> dict:
+    event = {"status": BookStatus.GENERATING, "progress": text}
+    if delta is not None:
+        event["delta"] = delta
+    return event
+
+async def drain(subscription) -> list:
+    events = []
+    while len(subscription):
+        _, payload = await subscription.get()
+        events.append(json.loads(payload))
+    return events
+
+async def test_publish_fans_out_to_every_subscriber():
+    """Each subscriber receives the same serialized event"""
+    service = EventService(max_queue_size=4, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    first = await service.subscribe(1)
+    second = await service.subscribe(1)
+    await service.publish(1, progress("outline"))
+    first_id, first_payload = await first.get()
+    second_id, second_payload = await second.get()
+    assert first_id == second_id
+    assert first_payload == second_payload == json.dumps(progress("outline"))
+
+async def test_drop_oldest_bounds_the_queue():
+    """A stalled subscriber keeps only the newest events"""
+    service = EventService(max_queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    subscription = await service.subscribe(1)
+    for step in range(5):
+        await service.publish(1, progress(f"step {step}"))
+
+    assert [e["progress"] for e in await drain(subscription)] == ["step 3", "step 4"]
+    assert service.metrics()["dropped"] == 3
+
+async def test_coalesce_progress_merges_deltas_and_keeps_terminal_events():
+    """Overflowing progress events merge without losing streamed text"""
+    service = EventService(max_queue_size=2, overflow_policy=OverflowPolicy.COALESCE_PROGRESS)
+    subscription = await service.subscribe(1)
+    await service.publish(1, progress("writing", "Once "))
+    await service.publish(1, progress("writing", "upon "))
+    await service.publish(1, progress("writing", "a time"))
+    await service.publish(1, {"status": BookStatus.COMPLETED, "progress": "done"})
+
+    events = await drain(subscription)
+    assert "".join(e.get("delta", "") for e in events) == "Once upon a time"
+    assert events[-1]["status"] == BookStatus.COMPLETED
+    assert service.metrics()["coalesced"] == 2
+
+async def test_disconnect_policy_closes_slow_subscribers():
+    """An overflowing subscriber is removed and its reader sees the end of the stream"""
+    service = EventService(max_queue_size=1, overflow_policy=OverflowPolicy.DISCONNECT)
+    subscription = await service.subscribe(1)
+    await service.publish(1, progress("one"))
+    await service.publish(1, progress("two"))
+
+    assert await asyncio.wait_for(subscription.get(), timeout=1) is None
+    metrics = service.metrics()
+    assert metrics["subscribers"] == 0
+    assert metrics["disconnected"] == 1
+
+async def test_resubscribe_replays_events_after_last_event_id():
+    """A reconnecting client gets exactly the events it missed, in order"""
+    service = EventService(max_queue_size=8, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    subscription = await service.subscribe(1)
+    await service.publish(1, progress("outline"))
+    last_seen, _ = await subscription.get()
+    await service.unsubscribe(1, subscription)
+
+    await service.publish(1, progress("chapter 1"))
+    await service.publish(1, progress("chapter 2"))
+
+    resumed = await service.subscribe(1, last_event_id=last_seen)
+    assert [e["progress"] for e in await drain(resumed)] == ["chapter 1", "chapter 2"]
+
+async def test_event_ids_increase_monotonically():
+    service = EventService()
+    ids = [service._next_event_id() for _ in range(1000)]
+    assert ids == sorted(set(ids))
+
+async def test_coalesced_publishes_merge_within_the_window():
+    """Many streamed deltas reach subscribers as one frame per window"""
+    service = EventService(max_queue_size=64, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    subscription = await service.subscribe(1)
+    for word in ["It ", "was ", "a ", "dark ", "night"]:
+        await service.publish(1, progress("writing", word), coalesce=True)
+    assert len(subscription) == 0
+
+    await asyncio.sleep(settings.EVENT_COALESCE_WINDOW_MS / 1000 * 3)
+    assert [e["delta"] for e in await drain(subscription)] == ["It was a dark night"]
+
+async def test_terminal_event_flushes_pending_progress_first():
+    """Ordering is kept when a completion arrives inside the window"""
+    service = EventService(max_queue_size=64, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    subscription = await service.subscribe(1)
+    await service.publish(1, progress("writing", "The end."), coalesce=True)
+    await service.publish(1, {"status": BookStatus.COMPLETED, "progress": "done"}, coalesce=True)
+
+    events = await drain(subscription)
+    assert [e.get("delta") for e in events] == ["The end.", None]
+    assert events[-1]["status"] == BookStatus.COMPLETED
+
+async def test_coalesced_delta_is_flushed_at_the_byte_cap():
+    service = EventService(max_queue_size=64, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    subscription = await service.subscribe(1)
+    chunk = "x" * (settings.EVENT_COALESCE_MAX_BYTES // 2)
+    await service.publish(1, progress("writing", chunk), coalesce=True)
+    await service.publish(1, progress("writing", chunk), coalesce=True)
+    assert len(subscription) == 1
+
+async def test_replay_is_capped_at_the_queue_size():
+    """A long gap resumes from the newest events instead of overflowing on replay"""
+    service = EventService(max_queue_size=3, overflow_policy=OverflowPolicy.DISCONNECT)
+    subscription = await service.subscribe(1)
+    await service.publish(1, progress("outline"))
+    last_seen, _ = await subscription.get()
+    await service.unsubscribe(1, subscription)
+
+    for chapter in range(1, 6):
+        await service.publish(1, progress(f"chapter {chapter}"))
+
+    resumed = await service.subscribe(1, last_event_id=last_seen)
+    assert not resumed.closed
+    assert [e["progress"] for e in await drain(resumed)] == ["chapter 3", "chapter 4", "chapter 5"]
+    metrics = service.metrics()
+    assert metrics["dropped"] == 2
+    assert metrics["disconnected"] == 0
+
+async def test_flushed_event_reaches_the_broker_before_the_next_publish():
+    """A slow flush cannot be overtaken by a publish that starts while it is in flight"""
+    service = EventService(max_queue_size=64, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    subscription = await service.subscribe(1)
+    broker_publish = service.broker.publish
+
+    async def slow_publish(book_id, event_id, payload):
+        if "delta" in json.loads(payload):
+            await asyncio.sleep(0.05)
+        await broker_publish(book_id, event_id, payload)
+
+    service.broker.publish = slow_publish
+    await service.publish(1, progress("writing", "The end."), coalesce=True)
+    flushing = asyncio.create_task(service.flush(1))
+    await asyncio.sleep(0)
+    await service.publish(1, {"status": BookStatus.COMPLETED, "progress": "done"})
+    await flushing
+
+    events = await drain(subscription)
+    assert [e.get("delta") for e in events] == ["The end.", None]
+    assert service._publish_locks == {}
+
+async def test_parallel_chapter_streams_are_coalesced_separately():
+    """Deltas from chapters written at the same time never merge into one another"""
+    service = EventService(max_queue_size=64, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    subscription = await service.subscribe(1)
+    for chapter, word in [(0, "It "), (1, "The "), (0, "was "), (1, "end.")]:
+        await service.publish(1, {**progress("writing", word), "chapter": chapter}, coalesce=True)
+    await service.flush(1)
+
+    events = await drain(subscription)
+    assert {e["chapter"]: e["delta"] for e in events} == {0: "It was ", 1: "The end."}
\ No newline at end of file
@@ -0,0 +1,24 @@
+import asyncio
+import json
+from app.routers.events import event_generator
+from app.services.event_service import event_service
+
+async def test_stream_emits_ids_and_releases_subscription_on_disconnect():
+    """Cancelling the stream (as Starlette does on disconnect) unsubscribes immediately"""
+    stream = event_generator(42)
+    next_frame = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    assert event_service.metrics()["subscribers"] == 1
+
+    await event_service.publish(42, {"status": "generating", "progress": "outline"})
+    frame = await asyncio.wait_for(next_frame, timeout=1)
+    id_line, data_line, _, _ = frame.split("\n")
+    assert id_line.startswith("id: ")
+    assert json.loads(data_line[len("data: "):])["progress"] == "outline"
+
+    pending = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    pending.cancel()
+    await asyncio.gather(pending, return_exceptions=True)
+    await stream.aclose()
+    assert event_service.metrics()["subscribers"] == 0
\ No newline at end of file
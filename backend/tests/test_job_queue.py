@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Book, GenerationJob, JobStatus
+from app.services.job_queue import JobQueue
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Book(title="The Long Road"))
+    session.commit()
+    yield session
+    session.close()
+
+async def test_only_one_active_job_per_book(db):
+    """Repeated enqueues share a job, and the index rejects a second active row"""
+    queue = JobQueue(db)
+    job = await queue.enqueue(1)
+    assert (await queue.enqueue(1)).id == job.id
+
+    db.add(GenerationJob(book_id=1, status=JobStatus.QUEUED, attempts=0, max_attempts=3))
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+async def test_stale_worker_cannot_finish_a_reclaimed_job(db):
+    """complete/fail only apply for the worker currently holding the lease"""
+    queue = JobQueue(db)
+    job = await queue.enqueue(1)
+    await queue.claim("worker-1")
+
+    # The lease moves to worker-2, e.g. after worker-1 stalled past its visibility timeout
+    db.query(GenerationJob).filter(GenerationJob.id == job.id).update({GenerationJob.worker_id: "worker-2"})
+    db.commit()
+
+    assert not await queue.complete(job.id, "worker-1")
+    assert not await queue.fail(job.id, "worker-1", "stale")
+    db.expire_all()
+    assert queue.get_job(job.id).status == JobStatus.RUNNING
+
+    assert await queue.complete(job.id, "worker-2")
+    db.expire_all()
+    assert queue.get_job(job.id).status == JobStatus.COMPLETED
+
+async def test_fail_requeues_until_attempts_run_out(db):
+    queue = JobQueue(db)
+    job = await queue.enqueue(1)
+    for attempt in range(1, job.max_attempts + 1):
+        await queue.claim(f"worker-{attempt}")
+        assert await queue.fail(job.id, f"worker-{attempt}", "boom")
+        db.expire_all()
+
+    job = queue.get_job(job.id)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "boom"
\ No newline at end of file
@@ -0,0 +1,85 @@
+import pytest
+from app.services.ai.models.base import AIModel
+from app.services.ai.pipeline.master_pipeline import MasterPipeline
+from app.services.ai.quality.evaluator import QualityEvaluator
+
+BOOK = {"id": 1, "title": "The Long Road", "genre": "Mystery"}
+
+class ScriptedJudge(AIModel):
+    """Gives every category the next score from a fixed script"""
+
+    def __init__(self, overall_scores):
+        self.overall_scores = list(overall_scores)
+
+    async def generate(self, prompt: str) -> str:
+        return ""
+
+    async def analyze(self, content: str):
+        score = self.overall_scores.pop(0)
+        return {"technical": score, "literary": score, "emotional": score}
+
+class FakeEditor:
+    def __init__(self, improves: bool = True):
+        self.improves = improves
+        self.refined_chapters = 0
+
+    async def refine_content(self, content, metadata):
+        return content + " (edited)"
+
+    async def refine_chapters(self, content, metadata, threshold):
+        self.refined_chapters += 1
+        return content + " (polished)" if self.improves else content
+
+def pipeline(judge: AIModel, editor: FakeEditor = None) -> MasterPipeline:
+    master = MasterPipeline()
+    master.quality_evaluator = QualityEvaluator([judge])
+    master.content_editor = editor or FakeEditor()
+
+    async def analyze_market(book_data):
+        return {"trends": []}
+
+    async def plan(book_data):
+        return "outline"
+
+    async def write(book_data, outline):
+        return {"content": "draft"}
+
+    async def develop_characters(outline, genre):
+        return {"characters": []}
+
+    async def prepare_for_market(book_data, content):
+        return {"blurb": content}
+
+    master.market_analyzer.analyze_market = analyze_market
+    master.generation_pipeline.plan = plan
+    master.generation_pipeline.write = write
+    master.character_developer.develop_characters = develop_characters
+    master.market_prep.prepare_for_market = prepare_for_market
+    return master
+
+def test_evaluator_requires_a_judge():
+    with pytest.raises(ValueError):
+        QualityEvaluator([])
+
+def test_master_pipeline_has_judges():
+    assert MasterPipeline().quality_evaluator.models
+
+async def test_refinement_stage_runs_until_the_quality_threshold():
+    master = pipeline(ScriptedJudge([6.0, 9.5]))
+    result = await master.generate_book(BOOK)
+
+    assert result["content"] == "draft (edited) (polished)"
+    assert result["quality_metrics"]["overall"] == pytest.approx(9.5)
+    assert result["market_materials"] == {"blurb": "draft (edited) (polished)"}
+    assert master.content_editor.refined_chapters == 1
+    assert result["schedule"]["critical_path"][-2:] == ["refinement", "market_preparation"]
+
+async def test_refinement_stops_when_no_chapter_changes():
+    """An unchanged manuscript is not scored again until max_iterations"""
+    judge = ScriptedJudge([6.0, 6.0, 6.0])
+    master = pipeline(judge, FakeEditor(improves=False))
+    result = await master.generate_book(BOOK)
+
+    assert result["content"] == "draft (edited)"
+    assert master.content_editor.refined_chapters == 1
+    assert judge.overall_scores == [6.0, 6.0]
\ No newline at end of file
@@ -0,0 +1,36 @@
+from app.services.payload_codec import PayloadCodec, IDENTITY
+
+CHAPTER = (
+    "The rain had not stopped for three days, and the lighthouse keeper's daughter "
+    "had begun to count the drops against the glass as if they were letters in a code. "
+) * 200
+
+def test_round_trip_compresses_prose():
+    """Large prose payloads are stored compressed and decode to the same text"""
+    codec = PayloadCodec()
+    encoding, payload = codec.encode(CHAPTER)
+
+    assert encoding != IDENTITY
+    assert len(payload) < len(CHAPTER) / 2
+    assert codec.decode(encoding, payload) == CHAPTER
+
+def test_small_and_legacy_payloads_pass_through():
+    """Short outputs stay raw, and rows without an encoding decode unchanged"""
+    codec = PayloadCodec(min_bytes=1024)
+
+    assert codec.encode("short outline") == (IDENTITY, "short outline")
+    assert codec.decode(None, "written before compression") == "written before compression"
+
+def test_dictionary_payloads_need_the_same_dictionary():
+    """A payload compressed with a dictionary only decodes with that dictionary"""
+    dictionary = b"the lighthouse keeper's daughter had begun to count the drops"
+    codec = PayloadCodec(dictionary=dictionary)
+    encoding, payload = codec.encode(CHAPTER)
+
+    assert "+dict:" in encoding
+    assert codec.decode(encoding, payload) == CHAPTER
+    try:
+        PayloadCodec(dictionary=b"another dictionary").decode(encoding, payload)
+    except ValueError:
+        return
+    assert False, "expected a ValueError for the wrong dictionary"
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+import httpx
+from app.core.config import settings
+from app.services.retry_service import AdaptiveRateLimiter, RetryService
+from app.services.client_pool import RateLimitedTransport
+
+async def test_concurrency_limit_is_enforced():
+    """No more calls than the current limit run at once"""
+    limiter = AdaptiveRateLimiter(6000, initial_concurrency=2, max_concurrency=10)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*[call() for _ in range(10)])
+    assert peak == 2
+
+async def test_additive_increase_multiplicative_decrease():
+    """Successes grow the limit slowly, a rate limit halves it once per burst"""
+    limiter = AdaptiveRateLimiter(6000, initial_concurrency=4, max_concurrency=8)
+    for _ in range(4):
+        limiter.record_success()
+    assert 4.9 < limiter.concurrency_limit < 5.0
+
+    limiter.record_rate_limited()
+    limiter.record_rate_limited()
+    assert 2.4 < limiter.concurrency_limit < 2.5
+
+async def test_transport_reports_rate_limits():
+    """429 responses seen by the pooled transport shrink the provider limit"""
+    limiter = AdaptiveRateLimiter(6000, initial_concurrency=8, max_concurrency=8)
+    upstream = httpx.MockTransport(lambda request: httpx.Response(429, headers={"retry-after": "0"}))
+
+    async with httpx.AsyncClient(transport=RateLimitedTransport(limiter, upstream)) as client:
+        response = await client.get("https://api.example.com/v1/messages")
+
+    assert response.status_code == 429
+    assert limiter.concurrency_limit == 4
+    assert limiter.in_flight == 0
+
+async def test_streamed_responses_hold_their_slot_until_closed():
+    """A streamed body counts against the concurrency limit until it is fully read"""
+    limiter = AdaptiveRateLimiter(6000, initial_concurrency=1, max_concurrency=1)
+    streaming = 0
+    peak = 0
+
+    async def body():
+        nonlocal streaming, peak
+        streaming += 1
+        peak = max(peak, streaming)
+        for _ in range(3):
+            await asyncio.sleep(0.01)
+            yield b"token "
+        streaming -= 1
+
+    upstream = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+    async with httpx.AsyncClient(transport=RateLimitedTransport(limiter, upstream)) as client:
+        async def stream_one():
+            async with client.stream("POST", "https://api.example.com/v1/messages") as response:
+                return b"".join([chunk async for chunk in response.aiter_bytes()])
+
+        bodies = await asyncio.gather(*[stream_one() for _ in range(5)])
+
+    assert bodies == [b"token token token "] * 5
+    assert peak == 1
+    assert limiter.in_flight == 0
+
+def test_provider_quota_is_split_across_processes(monkeypatch):
+    """API and worker processes each take an equal share of the account quota"""
+    monkeypatch.setattr(settings, "OPENAI_REQUESTS_PER_MINUTE", 600)
+    monkeypatch.setattr(settings, "JOB_WORKER_PROCESSES", 2)
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_PROCESSES", None)
+    assert RetryService().limiter("openai").rate == 600 / 3 / 60
+
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_PROCESSES", 6)
+    assert RetryService().limiter("openai").rate == 600 / 6 / 60
\ No newline at end of file
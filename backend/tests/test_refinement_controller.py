@@ -0,0 +1,54 @@
+import pytest
+from app.services.ai.refinement.controller import RefinementController, StopReason, estimate_tokens
+
+def run(controller: RefinementController, scores, tokens: int = 100) -> StopReason:
+    """Drive the controller through the given scores until it stops"""
+    controller.start("draft")
+    for index, score in enumerate(scores):
+        if controller.should_stop():
+            break
+        controller.record(f"version {index}", score, tokens)
+    return controller.should_stop()
+
+def test_stops_when_threshold_is_reached():
+    controller = RefinementController(quality_threshold=9.0, max_iterations=5)
+    assert run(controller, [7.0, 9.2, 9.5]) == StopReason.THRESHOLD_REACHED
+    assert controller.iterations == 2
+    assert controller.result().content == "version 1"
+
+def test_always_runs_one_pass_even_if_baseline_meets_threshold():
+    controller = RefinementController(quality_threshold=9.0)
+    controller.start("draft", score=9.5)
+    assert controller.should_stop() is None
+
+def test_stops_at_max_iterations():
+    controller = RefinementController(quality_threshold=10.0, max_iterations=3)
+    assert run(controller, [5.0, 6.0, 7.0, 8.0]) == StopReason.MAX_ITERATIONS
+    assert controller.iterations == 3
+
+def test_stops_on_plateau_and_keeps_the_best_version():
+    """Gains below epsilon end the loop; a worse last pass does not replace the best"""
+    controller = RefinementController(quality_threshold=10.0, max_iterations=10, epsilon=0.1)
+    assert run(controller, [7.0, 8.0, 7.5]) == StopReason.PLATEAU
+
+    result = controller.result()
+    assert result.content == "version 1"
+    assert result.score == 8.0
+
+def test_stops_before_an_iteration_would_exceed_the_token_budget():
+    controller = RefinementController(quality_threshold=10.0, max_iterations=10, token_budget=250)
+    assert run(controller, [5.0, 6.0, 7.0, 8.0], tokens=100) == StopReason.TOKEN_BUDGET
+    assert controller.tokens_used == 200
+
+def test_time_budget(monkeypatch):
+    clock = iter([0.0, 10.0, 10.0, 10.0, 10.0])
+    monkeypatch.setattr("app.services.ai.refinement.controller.time.monotonic", lambda: next(clock))
+    controller = RefinementController(quality_threshold=10.0, max_iterations=10, time_budget=15.0)
+    controller.start("draft")
+    controller.record("version 0", 5.0, 10)
+    # 10s elapsed plus another 10s iteration would overrun the 15s budget
+    assert controller.should_stop() == StopReason.TIME_BUDGET
+
+@pytest.mark.parametrize("texts, expected", [(("abcd",), 1), (("ab", "cdefgh"), 2), ((), 0)])
+def test_estimate_tokens(texts, expected):
+    assert estimate_tokens(*texts) == expected
\ No newline at end of file
@@ -0,0 +1,39 @@
+from app.services.similarity_cache import MinHashIndex
+
+PROMPT = (
+    "Title: The Lighthouse Keeper's Daughter. Description: A young woman inherits "
+    "a remote lighthouse and uncovers letters that reveal her family's smuggling past. "
+    "Genre: Mystery. Target Audience: Adult. Style: Atmospheric. Tone: Brooding."
+)
+
+def test_near_duplicate_prompt_is_a_hit():
+    """Punctuation and a changed word still match above the threshold"""
+    index = MinHashIndex(threshold=0.8)
+    index.add("original", PROMPT, "outline", 9.7)
+
+    variant = PROMPT.replace("Daughter.", "Daughter!").replace("remote", "distant")
+    result = index.query(variant)
+
+    assert result is not None
+    output, score, similarity = result
+    assert output == "outline"
+    assert score == 9.7
+    assert 0.8 <= similarity < 1.0
+
+def test_unrelated_prompt_is_a_miss():
+    """A different book request does not reuse the cached outline"""
+    index = MinHashIndex(threshold=0.8)
+    index.add("original", PROMPT, "outline", 9.7)
+
+    assert index.query(
+        "Title: Starfall Academy. Description: Cadets train to pilot living ships "
+        "in a war against a machine empire. Genre: Science Fiction. Target Audience: Young Adult."
+    ) is None
+
+def test_index_is_bounded():
+    """Oldest entries are evicted once max_entries is reached"""
+    index = MinHashIndex(max_entries=2)
+    for number in range(3):
+        index.add(f"prompt-{number}", f"{PROMPT} Volume {number}", "outline", 9.6)
+
+    assert len(index) == 2
\ No newline at end of file
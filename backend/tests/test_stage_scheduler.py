@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from app.services.ai.pipeline.scheduler import Stage, StageScheduler
+
+def sleeper(seconds: float, value):
+    async def run(inputs):
+        await asyncio.sleep(seconds)
+        return value
+    return run
+
+async def test_independent_stages_run_concurrently():
+    """Stages without a dependency between them should overlap"""
+    generation_started = asyncio.Event()
+
+    async def market(inputs):
+        # Only finishes if generation is running at the same time
+        await asyncio.wait_for(generation_started.wait(), timeout=1)
+        return "market"
+
+    async def generation(inputs):
+        generation_started.set()
+        return "outline"
+
+    scheduler = StageScheduler([
+        Stage("market", market),
+        Stage("generation", generation),
+        Stage("characters", sleeper(0.05, "cast"), inputs=["generation"])
+    ])
+
+    schedule = await scheduler.run()
+
+    assert schedule.results == {"market": "market", "generation": "outline", "characters": "cast"}
+    assert schedule.critical_path == ["generation", "characters"]
+
+async def test_stage_receives_its_inputs():
+    """A stage is called with the results of the stages it depends on"""
+    async def combine(inputs):
+        return inputs["a"] + inputs["b"]
+
+    schedule = await StageScheduler([
+        Stage("a", sleeper(0, 1)),
+        Stage("b", sleeper(0, 2)),
+        Stage("sum", combine, inputs=["a", "b"])
+    ]).run()
+
+    assert schedule.results["sum"] == 3
+
+def test_cycles_are_rejected():
+    """Declaring a dependency cycle fails before anything runs"""
+    with pytest.raises(ValueError):
+        StageScheduler([
+            Stage("a", sleeper(0, 1), inputs=["b"]),
+            Stage("b", sleeper(0, 2), inputs=["a"])
+        ])
\ No newline at end of file
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.supabase_executor import SupabaseExecutor
+
+class BlockingQuery:
+    def __init__(self, seconds: float, release: threading.Event = None):
+        self.seconds = seconds
+        self.release = release
+
+    def execute(self):
+        if self.release:
+            self.release.wait(self.seconds)
+        else:
+            time.sleep(self.seconds)
+        return "done"
+
+async def test_execute_does_not_block_the_loop():
+    """Other tasks keep running while a query is in flight"""
+    executor = SupabaseExecutor(2, timeout=5.0)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    result, _ = await asyncio.gather(executor.execute(BlockingQuery(0.2)), ticker())
+    assert result == "done"
+    assert ticks == 5
+    executor.shutdown()
+
+async def test_timed_out_query_keeps_its_slot_until_it_finishes():
+    """A timeout frees the caller but not the worker thread still running the query"""
+    executor = SupabaseExecutor(1, timeout=0.05)
+    release = threading.Event()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.execute(BlockingQuery(5.0, release))
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.execute(BlockingQuery(0.0))
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert await executor.execute(BlockingQuery(0.0)) == "done"
+    executor.shutdown()
\ No newline at end of file